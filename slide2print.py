@@ -1,13 +1,41 @@
 import io
 import os
+import atexit
+import hashlib
+import sys
+import argparse
+import time
+import sqlite3
+import json
+import uuid
+import zipfile
+import zlib
 import threading
+import multiprocessing
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import closing
+from multiprocessing import connection, shared_memory
+from queue import Empty
 from math import ceil
 import fitz                # PyMuPDF
-from PIL import Image, ImageOps
+try:
+    import psutil          # Optional: enforces worker memory limits on every platform
+except ImportError:
+    psutil = None
+try:
+    import pikepdf         # Optional: linearized output from the optimization pass
+except ImportError:
+    pikepdf = None
+try:
+    import numpy as np     # Optional: needed for sheet compositing
+except ImportError:
+    np = None
+from PIL import Image, ImageChops, ImageDraw, ImageFont, ImageOps
 from reportlab.pdfgen import canvas
-from reportlab.lib.pagesizes import A4
+from reportlab.lib.pagesizes import A3, A4, legal, letter
 from reportlab.lib.units import mm
-from reportlab.lib.utils import ImageReader
+from reportlab.pdfbase import pdfdoc, pdfmetrics
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk, BooleanVar
 import webbrowser
@@ -18,6 +46,11 @@ import subprocess
 import platform
 
 
+CONFIG_DIR = os.path.join(os.path.expanduser("~"), ".pdf_processor")
+PREVIEW_WIDTH = 230  # Pixel width of a previewed A4 sheet
+
+# MuPDF is not thread-safe; the GUI's background threads share this lock
+FITZ_LOCK = threading.Lock()
 
 class ThemeManager:
     """Handles theming for the application"""
@@ -99,50 +132,216 @@ class ThemeManager:
         
         return theme
 
+class SplashAssetCache:
+    """On-disk cache of decoded splash frames, keyed by source file hash and target size"""
+    
+    def __init__(self, cache_dir=None):
+        self.cache_dir = cache_dir or os.path.join(CONFIG_DIR, "splash_cache")
+        
+    @staticmethod
+    def make_key(path, width=None, height=None):
+        """Hash the source file contents together with the requested frame size"""
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+        return f"{digest.hexdigest()[:32]}_{width or 0}x{height or 0}"
+        
+    def _entry_dir(self, key):
+        return os.path.join(self.cache_dir, key)
+        
+    def _read_delays(self, key):
+        with open(os.path.join(self._entry_dir(key), "index.txt"), "r") as f:
+            return [int(line) for line in f if line.strip()]
+            
+    def _read_frame(self, key, idx):
+        with open(os.path.join(self._entry_dir(key), f"frame_{idx:04d}.gif"), "rb") as f:
+            return f.read()
+    
+    def load_first(self, key):
+        """Return (frame_data, delay) for the first cached frame, or None on a miss"""
+        try:
+            delays = self._read_delays(key)
+            return (self._read_frame(key, 0), delays[0]) if delays else None
+        except (OSError, ValueError):
+            return None
+            
+    def load(self, key):
+        """Return the list of cached (frame_data, delay) pairs, or None on a miss"""
+        try:
+            delays = self._read_delays(key)
+            return [(self._read_frame(key, i), delay) for i, delay in enumerate(delays)] or None
+        except (OSError, ValueError):
+            return None
+    
+    def store(self, key, frames):
+        """Write frames to the cache; the entry appears atomically once complete"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_dir = tempfile.mkdtemp(prefix=f".{key}-", dir=self.cache_dir)
+        try:
+            for i, (data, _) in enumerate(frames):
+                with open(os.path.join(tmp_dir, f"frame_{i:04d}.gif"), "wb") as f:
+                    f.write(data)
+            # The index is written last so a readable index implies complete frames
+            with open(os.path.join(tmp_dir, "index.txt"), "w") as f:
+                f.write("".join(f"{delay}\n" for _, delay in frames))
+            os.rename(tmp_dir, self._entry_dir(key))
+        except OSError:
+            # Another instance stored the same entry first, or the disk is read-only
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+def convert_webm_to_gif(webm_path, gif_path):
+    """Convert webm to gif using ffmpeg if available"""
+    try:
+        # Check if ffmpeg is available
+        try:
+            subprocess.run(["ffmpeg", "-version"], 
+                          stdout=subprocess.PIPE, 
+                          stderr=subprocess.PIPE, 
+                          check=True)
+        except (subprocess.SubprocessError, FileNotFoundError):
+            print("FFmpeg not available, can't convert webm to gif")
+            return None
+            
+        # Convert webm to gif using ffmpeg
+        cmd = [
+            "ffmpeg", "-y",
+            "-i", webm_path,
+            "-vf", "fps=10,scale=400:-1:flags=lanczos,split[s0][s1];[s0]palettegen[p];[s1][p]paletteuse",
+            "-loop", "0",
+            gif_path
+        ]
+        
+        subprocess.run(cmd, 
+                      stdout=subprocess.PIPE, 
+                      stderr=subprocess.PIPE, 
+                      check=True)
+                      
+        return gif_path if os.path.exists(gif_path) else None
+        
+    except Exception as e:
+        print(f"Error converting webm to gif: {e}")
+        return None
+
 class AnimatedGif:
-    """Class to handle animated GIF display"""
+    """Class to handle animated GIF (or webm) display.
     
-    def __init__(self, master, path, width=None, height=None, loop=True):
+    Frames are decoded, resized and encoded on a background thread and cached
+    on disk; the UI thread only turns ready frame data into PhotoImages. The
+    first frame is shown as soon as it is available, from the cache when possible.
+    """
+    
+    POLL_MS = 30
+    FRAMES_PER_POLL = 4
+    
+    def __init__(self, master, path, width=None, height=None, loop=True, 
+                 on_error=None, cache=None):
         self.master = master
         self.path = path
+        self.width = width
+        self.height = height
         self.loop = loop
+        self.on_error = on_error
+        self.cache = cache or SplashAssetCache()
         self.frames = []
+        self.delays = []
         self.current_frame = 0
         self.playing = False
-        self._load_frames(width, height)
         
         self.canvas = tk.Canvas(master, bd=0, highlightthickness=0)
         self.canvas_obj = None
+        if width and height:
+            self.canvas.config(width=width, height=height)
+        
+        # Frame data produced by the loader thread, waiting to become PhotoImages
+        self._lock = threading.Lock()
+        self._ready = []
+        self._loaded = False
+        self._error = None
+        self._animate_id = None
+        self._poll_id = None
         
-    def _load_frames(self, width=None, height=None):
         try:
-            gif = Image.open(self.path)
-            self.frames = []
-            self.delays = []
+            self._key = self.cache.make_key(path, width, height)
+        except OSError as e:
+            self._key = None
+            self._error = e
             
-            try:
-                while True:
-                    # Get frame duration in milliseconds
-                    delay = gif.info.get('duration', 100)  # Default to 100ms
-                    
-                    # Copy and resize the frame if dimensions provided
-                    frame = gif.copy()
-                    if width and height:
-                        frame = frame.resize((width, height), Image.LANCZOS)
-                    
-                    # Convert to PhotoImage and store
-                    photoframe = tk.PhotoImage(data=self._get_gif_frame_as_data(frame))
-                    self.frames.append(photoframe)
-                    self.delays.append(delay)
+        # Show the first cached frame right away; the loader fills in the rest
+        first = self.cache.load_first(self._key) if self._key else None
+        self._skip = 0
+        if first:
+            self._add_frame(*first)
+            self._skip = 1
+            
+        if self._key:
+            threading.Thread(target=self._load_frames, daemon=True).start()
+        self._poll_id = self.master.after(0, self._poll_frames)
+        
+    def _load_frames(self):
+        """Decode all frames on a background thread"""
+        try:
+            frames = self.cache.load(self._key)
+            if frames is None:
+                frames = self._decode_frames()
+                if frames:
+                    self.cache.store(self._key, frames)
+            else:
+                for frame in frames:
+                    self._publish(frame)
                     
-                    # Move to next frame
-                    gif.seek(gif.tell() + 1)
-            except EOFError:
-                pass  # End of frames
-                
+            if not frames:
+                raise ValueError("animation has no frames")
         except Exception as e:
-            print(f"Error loading animation: {e}")
-            self.frames = []
+            with self._lock:
+                self._error = e
+        finally:
+            self._loaded = True
+    
+    def _publish(self, frame):
+        """Hand a frame to the UI unless it is already showing (e.g. from the cache)"""
+        with self._lock:
+            if self._skip:
+                self._skip -= 1
+            else:
+                self._ready.append(frame)
+    
+    def _decode_frames(self):
+        gif_path, temp_path = self.path, None
+        if self.path.lower().endswith('.webm'):
+            os.makedirs(self.cache.cache_dir, exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(suffix=".gif", dir=self.cache.cache_dir)
+            os.close(fd)
+            gif_path = convert_webm_to_gif(self.path, temp_path)
+            if not gif_path:
+                os.remove(temp_path)
+                raise RuntimeError("could not convert webm animation")
+                
+        frames = []
+        try:
+            with Image.open(gif_path) as gif:
+                try:
+                    while True:
+                        # Get frame duration in milliseconds
+                        delay = gif.info.get('duration', 100)  # Default to 100ms
+                        
+                        # Copy and resize the frame if dimensions provided
+                        frame = gif.copy()
+                        if self.width and self.height:
+                            frame = frame.resize((self.width, self.height), Image.LANCZOS)
+                        
+                        # Encode off the UI thread and publish as soon as it's ready
+                        frames.append((self._get_gif_frame_as_data(frame), delay))
+                        self._publish(frames[-1])
+                        
+                        # Move to next frame
+                        gif.seek(gif.tell() + 1)
+                except EOFError:
+                    pass  # End of frames
+        finally:
+            if temp_path and os.path.exists(temp_path):
+                os.remove(temp_path)
+        return frames
     
     def _get_gif_frame_as_data(self, img):
         """Convert PIL Image to a data string that PhotoImage can use"""
@@ -150,47 +349,86 @@ class AnimatedGif:
             img.save(buffer, format="gif")
             return buffer.getvalue()
     
+    def _add_frame(self, data, delay):
+        self.frames.append(tk.PhotoImage(data=data))
+        self.delays.append(delay)
+        if len(self.frames) == 1 and self.canvas_obj is not None:
+            self._show_first_frame()
+    
+    def _poll_frames(self):
+        """Move decoded frames onto the UI a few at a time"""
+        self._poll_id = None
+        with self._lock:
+            batch = self._ready[:self.FRAMES_PER_POLL]
+            del self._ready[:self.FRAMES_PER_POLL]
+            error, done = self._error, self._loaded and not self._ready
+        
+        for data, delay in batch:
+            self._add_frame(data, delay)
+        
+        if error is not None and not self.frames:
+            print(f"Error loading animation: {error}")
+            if self.on_error:
+                self.on_error()
+            return
+        
+        if not done:
+            self._poll_id = self.master.after(self.POLL_MS, self._poll_frames)
+    
+    def _show_first_frame(self):
+        self.canvas.config(width=self.frames[0].width(), height=self.frames[0].height())
+        self.canvas.itemconfig(self.canvas_obj, image=self.frames[0])
+    
+    def _place_canvas(self):
+        self.canvas_obj = self.canvas.create_image(0, 0, anchor=tk.NW)
+        if self.frames:
+            self._show_first_frame()
+    
     def pack(self, **kwargs):
         self.canvas.pack(**kwargs)
-        self.canvas.config(width=self.frames[0].width(), height=self.frames[0].height())
-        self.canvas_obj = self.canvas.create_image(0, 0, anchor=tk.NW, image=self.frames[0])
+        self._place_canvas()
         
     def grid(self, **kwargs):
         self.canvas.grid(**kwargs)
-        self.canvas.config(width=self.frames[0].width(), height=self.frames[0].height())
-        self.canvas_obj = self.canvas.create_image(0, 0, anchor=tk.NW, image=self.frames[0])
+        self._place_canvas()
     
     def place(self, **kwargs):
         self.canvas.place(**kwargs)
-        self.canvas.config(width=self.frames[0].width(), height=self.frames[0].height())
-        self.canvas_obj = self.canvas.create_image(0, 0, anchor=tk.NW, image=self.frames[0])
+        self._place_canvas()
         
     def start(self):
-        if not self.frames:
-            return
-            
         self.playing = True
         self._animate()
         
     def stop(self):
         self.playing = False
+        for after_id in (self._animate_id, self._poll_id):
+            if after_id is not None:
+                self.master.after_cancel(after_id)
+        self._animate_id = self._poll_id = None
         
     def _animate(self):
+        self._animate_id = None
         if not self.playing:
             return
             
-        if self.frames:
-            # Update to the next frame
-            self.current_frame = (self.current_frame + 1) % len(self.frames)
-            self.canvas.itemconfig(self.canvas_obj, image=self.frames[self.current_frame])
-            
-            # Schedule the next frame update
-            delay = self.delays[self.current_frame]
-            self.master.after(delay, self._animate)
+        if len(self.frames) < 2:
+            # Wait for the loader to deliver more frames
+            self._animate_id = self.master.after(self.POLL_MS, self._animate)
+            return
             
-            # If we've reached the end and not looping, stop
-            if self.current_frame == len(self.frames) - 1 and not self.loop:
-                self.playing = False
+        # Update to the next frame
+        self.current_frame = (self.current_frame + 1) % len(self.frames)
+        self.canvas.itemconfig(self.canvas_obj, image=self.frames[self.current_frame])
+        
+        # If we've reached the end and not looping, stop
+        if self.current_frame == len(self.frames) - 1 and not self.loop and self._loaded:
+            self.playing = False
+            return
+        
+        # Schedule the next frame update
+        delay = self.delays[self.current_frame]
+        self._animate_id = self.master.after(delay, self._animate)
 
 class SplashScreen(tk.Toplevel):
     """Custom splash screen with animation support"""
@@ -199,6 +437,9 @@ class SplashScreen(tk.Toplevel):
         super().__init__(parent)
         self.parent = parent
         self.duration = duration
+        self.animation = None
+        self.dots = []
+        self._dots_after_id = None
         
         # Configure window
         self.overrideredirect(True)  # No window decorations
@@ -216,26 +457,17 @@ class SplashScreen(tk.Toplevel):
         self.frame = ttk.Frame(self)
         self.frame.pack(fill=tk.BOTH, expand=True)
         
-        # Load the default animation if needed
-        if not animation_path or not os.path.exists(animation_path):
+        # Add animation if available; frames are decoded in the background
+        # and a webm source is converted (once, then cached) off the UI thread
+        if animation_path and os.path.exists(animation_path) and \
+                animation_path.lower().endswith(('.gif', '.webm')):
+            self.animation = AnimatedGif(self.frame, animation_path, width=200, height=200,
+                                         on_error=self.create_default_animation)
+            self.animation.pack(pady=20)
+            self.animation.start()
+        else:
             # Create a placeholder animation
             self.create_default_animation()
-            
-        # Add animation if available
-        if animation_path and os.path.exists(animation_path):
-            # Check if it's a webm, convert if needed
-            if animation_path.lower().endswith('.webm'):
-                gif_path = self.convert_webm_to_gif(animation_path)
-                if gif_path:
-                    animation_path = gif_path
-                else:
-                    self.create_default_animation()
-                    animation_path = None
-            
-            if animation_path and animation_path.lower().endswith('.gif'):
-                self.animation = AnimatedGif(self.frame, animation_path, width=200, height=200)
-                self.animation.pack(pady=20)
-                self.animation.start()
         
         # Application name
         ttk.Label(self.frame, text="Slide2Print: Convert Slides into Printable PDFs", 
@@ -251,8 +483,18 @@ class SplashScreen(tk.Toplevel):
     
     def create_default_animation(self):
         """Create a placeholder animation label"""
+        if self.animation:
+            self.animation.stop()
+            self.animation.canvas.destroy()
+            self.animation = None
+            
         loading_frame = ttk.Frame(self.frame)
-        loading_frame.pack(pady=20)
+        siblings = self.frame.winfo_children()
+        if len(siblings) > 1:
+            # Take the animation's place above the title
+            loading_frame.pack(pady=20, before=siblings[0])
+        else:
+            loading_frame.pack(pady=20)
         
         # Create loading dots
         self.dots = []
@@ -273,48 +515,15 @@ class SplashScreen(tk.Toplevel):
                 dot.configure(foreground="#424242")  # Dim other dots
         
         next_idx = (idx + 1) % len(self.dots)
-        self.after(200, lambda: self.animate_dots(next_idx))
-    
-    def convert_webm_to_gif(self, webm_path):
-        """Convert webm to gif using ffmpeg if available"""
-        try:
-            # Check if ffmpeg is available
-            try:
-                subprocess.run(["ffmpeg", "-version"], 
-                              stdout=subprocess.PIPE, 
-                              stderr=subprocess.PIPE, 
-                              check=True)
-            except (subprocess.SubprocessError, FileNotFoundError):
-                print("FFmpeg not available, can't convert webm to gif")
-                return None
-                
-            # Create temporary gif path
-            temp_dir = tempfile.gettempdir()
-            gif_path = os.path.join(temp_dir, "splash_animation.gif")
-            
-            # Convert webm to gif using ffmpeg
-            cmd = [
-                "ffmpeg", "-y",
-                "-i", webm_path,
-                "-vf", "fps=10,scale=400:-1:flags=lanczos,split[s0][s1];[s0]palettegen[p];[s1][p]paletteuse",
-                "-loop", "0",
-                gif_path
-            ]
-            
-            subprocess.run(cmd, 
-                          stdout=subprocess.PIPE, 
-                          stderr=subprocess.PIPE, 
-                          check=True)
-                          
-            return gif_path if os.path.exists(gif_path) else None
-            
-        except Exception as e:
-            print(f"Error converting webm to gif: {e}")
-            return None
+        self._dots_after_id = self.after(200, lambda: self.animate_dots(next_idx))
 
     def finish(self):
         """End the splash screen and show main window"""
         self.progress.stop()
+        if self.animation:
+            self.animation.stop()
+        if self._dots_after_id is not None:
+            self.after_cancel(self._dots_after_id)
         self.destroy()
         self.parent.deiconify()  # Show the main window
 
@@ -399,163 +608,2724 @@ class MaterialButton(tk.Frame):
             # Remove ripple when animation complete
             self.canvas.delete(ripple_id)
     
-    def _on_release(self, event):
-        if self.command:
-            self.command()
+    def _on_release(self, event):
+        if self.command:
+            self.command()
+    
+    def config(self, **kwargs):
+        """Update button configuration"""
+        if "text" in kwargs:
+            self.canvas.itemconfig(self.text_id, text=kwargs["text"])
+        
+        if "bg" in kwargs:
+            self.bg = kwargs["bg"]
+            self.canvas.itemconfig(self.bg_id, fill=self.bg)
+            self.canvas.config(bg=self.bg)
+            
+        if "fg" in kwargs:
+            self.fg = kwargs["fg"]
+            self.canvas.itemconfig(self.text_id, fill=self.fg)
+            
+        if "hover_bg" in kwargs:
+            self.hover_bg = kwargs["hover_bg"]
+            
+        if "state" in kwargs:
+            if kwargs["state"] == "disabled":
+                self.canvas.unbind("<Button-1>")
+                self.canvas.unbind("<ButtonRelease-1>")
+                self.canvas.itemconfig(self.bg_id, fill="#bbbbbb")
+                self.canvas.itemconfig(self.text_id, fill="#888888")
+            else:
+                self.canvas.bind("<Button-1>", self._on_press)
+                self.canvas.bind("<ButtonRelease-1>", self._on_release)
+                self.canvas.itemconfig(self.bg_id, fill=self.bg)
+                self.canvas.itemconfig(self.text_id, fill=self.fg)
+
+class ProgressChannel:
+    """Coalesces progress events from worker threads into a bounded number of UI updates.
+
+    Workers call publish() as often as they like; only the latest payload per
+    topic is kept, and pending events are delivered at most max_rate times a
+    second, in the order their topics were first published.
+    """
+
+    def __init__(self, max_rate=10):
+        self.interval_ms = max(1, int(1000 / max_rate))
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._handlers = {}
+        self._master = None
+        self._after_id = None
+
+    def subscribe(self, topic, handler):
+        """Register the handler called with the latest payload of a topic"""
+        self._handlers[topic] = handler
+
+    def publish(self, topic, *args):
+        """Queue an event, replacing any undelivered event of the same topic (thread-safe)"""
+        with self._lock:
+            self._pending[topic] = args
+
+    def drain(self):
+        """Deliver all pending events on the calling thread"""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+
+        error = None
+        for topic, args in pending.items():
+            handler = self._handlers.get(topic)
+            if handler:
+                # A failing handler must not swallow the other topics' events
+                try:
+                    handler(*args)
+                except Exception as e:
+                    error = error or e
+        if error is not None:
+            raise error
+
+    def attach(self, master):
+        """Start delivering events on the Tk event loop of master"""
+        self._master = master
+        if self._after_id is None:
+            self._poll()
+
+    def detach(self):
+        """Stop the delivery loop"""
+        if self._master is not None and self._after_id is not None:
+            self._master.after_cancel(self._after_id)
+        self._after_id = None
+
+    def _poll(self):
+        # Keep polling even if a handler raised; Tk reports the exception
+        try:
+            self.drain()
+        finally:
+            self._after_id = self._master.after(self.interval_ms, self._poll)
+
+class ActivityIndicator(ttk.Frame):
+    """Row of pulsing dots, built once and reused for every busy period"""
+
+    def __init__(self, master, theme, count=5, interval=150, **kwargs):
+        super().__init__(master, **kwargs)
+        self.theme = theme
+        self.interval = interval
+        self.current = 0
+        self._after_id = None
+
+        self.dots = []
+        for i in range(count):
+            dot = ttk.Label(self, text="●", font=("Arial", 12), foreground=self.theme["fg"])
+            dot.grid(row=0, column=i, padx=3)
+            self.dots.append(dot)
+
+    @property
+    def running(self):
+        return self._after_id is not None
+
+    def start(self):
+        """Show the indicator and start pulsing (no-op if already running)"""
+        if not self.winfo_ismapped():
+            self.pack(pady=5)
+        if not self.running:
+            self._step()
+
+    def stop(self):
+        """Stop pulsing and hide the indicator"""
+        if self._after_id is not None:
+            self.after_cancel(self._after_id)
+            self._after_id = None
+        self.pack_forget()
+
+    def set_theme(self, theme):
+        self.theme = theme
+        for dot in self.dots:
+            dot.config(foreground=self.theme["fg"])
+
+    def _step(self):
+        for i, dot in enumerate(self.dots):
+            color = self.theme["accent"] if i == self.current else self.theme["fg"]
+            dot.config(foreground=color)
+
+        self.current = (self.current + 1) % len(self.dots)
+        self._after_id = self.after(self.interval, self._step)
+
+def _attach_shared_memory(name):
+    """Open an existing shared memory block without handing it to the resource tracker"""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)  # Python 3.13+
+    except TypeError:
+        return shared_memory.SharedMemory(name=name)
+
+class PixmapRing:
+    """Shared-memory ring of fixed-size slots for handing rendered pages to one writer.
+    
+    Item n of the render order always lives in slot n % slots. A render worker
+    waits for its slot to be released before writing (backpressure), and the
+    writer waits for it to be filled, so pages are read in order, in place,
+    without pickling. Slots must be a multiple of the worker count, with each
+    worker producing items n, n + workers, ... in increasing order; then a
+    slot is only ever contended by one worker and the ring cannot deadlock.
+    """
+    
+    WAIT_SECONDS = 1.0
+    
+    def __init__(self, slots, slot_size, ctx):
+        self.slots = slots
+        self.slot_size = slot_size
+        self.shm = shared_memory.SharedMemory(create=True, size=slots * slot_size)
+        self.owner = True
+        self.empty = [ctx.Semaphore(1) for _ in range(slots)]
+        self.full = [ctx.Semaphore(0) for _ in range(slots)]
+        self.sizes = ctx.Array("i", 2 * slots, lock=False)  # Width, height per slot
+        
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["shm"] = self.shm.name
+        state["owner"] = False
+        return state
+        
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.shm = _attach_shared_memory(state["shm"])
+        
+    def put(self, seq, pix):
+        """Copy an RGB pixmap into the slot of item seq (blocks while the slot is in use)"""
+        slot = seq % self.slots
+        nbytes = pix.width * pix.height * 3
+        if nbytes > self.slot_size:
+            raise ValueError(f"Rendered page needs {nbytes} bytes, slot holds {self.slot_size}")
+            
+        while not self.empty[slot].acquire(timeout=self.WAIT_SECONDS):
+            # The writer never releases the slot if it was killed (e.g. by the batch supervisor)
+            parent = multiprocessing.parent_process()
+            if parent is not None and not parent.is_alive():
+                raise RuntimeError("writer process exited")
+        offset = slot * self.slot_size
+        self.shm.buf[offset:offset + nbytes] = pix.samples_mv
+        self.sizes[2 * slot], self.sizes[2 * slot + 1] = pix.width, pix.height
+        self.full[slot].release()
+        
+    def get(self, seq, timeout=None):
+        """Return item seq as an Image backed by the slot, or None on timeout"""
+        slot = seq % self.slots
+        if not self.full[slot].acquire(timeout=timeout):
+            return None
+            
+        width, height = self.sizes[2 * slot], self.sizes[2 * slot + 1]
+        offset = slot * self.slot_size
+        view = self.shm.buf[offset:offset + width * height * 3]
+        return Image.frombuffer("RGB", (width, height), view, "raw", "RGB", 0, 1)
+        
+    def release(self, seq, img):
+        """Hand the slot of item seq back to the render workers"""
+        img.close()  # Drops the image's reference to the shared buffer
+        self.empty[seq % self.slots].release()
+        
+    def close(self):
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+def _render_worker(input_path, order, positions, render_scale, ring, errors):
+    """Render the given positions of order into the ring (runs in a child process)"""
+    try:
+        matrix = fitz.Matrix(render_scale, render_scale)
+        with open_pdf(input_path) as doc:
+            for pos in positions:
+                pix = doc.load_page(order[pos]).get_pixmap(matrix=matrix, alpha=False)
+                pix.invert_irect()
+                ring.put(pos, pix)
+    except Exception as e:
+        errors.put(f"page render failed: {e}")
+    finally:
+        ring.close()
+
+class ParallelPageRenderer:
+    """Renders and inverts pages on several processes, yielding them in order from a PixmapRing"""
+    
+    SLOTS_PER_WORKER = 2
+    POLL_SECONDS = 0.5
+    
+    def __init__(self, workers, render_scale):
+        self.workers = workers
+        self.render_scale = render_scale
+        
+    def slot_size(self, doc, order):
+        """Bytes needed for the largest rendered page"""
+        matrix = fitz.Matrix(self.render_scale, self.render_scale)
+        largest = 0
+        for idx in order:
+            rect = (doc.load_page(idx).rect * matrix).irect
+            largest = max(largest, rect.width * rect.height * 3)
+        return largest
+        
+    def iter_images(self, doc, input_path, order):
+        """Yield (page_index, image) in order; each image is only valid until the next one"""
+        order = list(order)
+        ctx = multiprocessing.get_context("spawn")
+        ring = PixmapRing(self.workers * self.SLOTS_PER_WORKER, self.slot_size(doc, order), ctx)
+        errors = ctx.Queue()
+        procs = [
+            ctx.Process(target=_render_worker, daemon=True,
+                        args=(input_path, order, range(k, len(order), self.workers),
+                              self.render_scale, ring, errors))
+            for k in range(self.workers)
+        ]
+        for proc in procs:
+            proc.start()
+            
+        try:
+            for pos, idx in enumerate(order):
+                img = ring.get(pos, timeout=self.POLL_SECONDS)
+                while img is None:
+                    self._check_workers(procs, errors)
+                    img = ring.get(pos, timeout=self.POLL_SECONDS)
+                try:
+                    yield idx, img
+                finally:
+                    ring.release(pos, img)
+        finally:
+            for proc in procs:
+                if proc.is_alive():
+                    proc.terminate()
+                proc.join()
+            ring.close()
+            
+    def _check_workers(self, procs, errors):
+        try:
+            raise RuntimeError(errors.get_nowait())
+        except Empty:
+            pass
+        for proc in procs:
+            if proc.exitcode not in (None, 0):
+                raise RuntimeError(f"Render worker exited with code {proc.exitcode}")
+
+PAPER_SIZES = {"A4": A4, "A3": A3, "Letter": letter, "Legal": legal}
+PAGES_PER_SHEET = (1, 2, 3, 4, 6)   # Layouts the sheet arrangement supports
+
+class Cancelled(Exception):
+    """Raised at the next page of a conversion whose CancelToken was cancelled"""
+
+class CancelToken:
+    """Cancel and pause flags that a conversion checks between pages.
+    
+    The flags are multiprocessing events, so the token also reaches worker
+    processes, but only when passed at process creation (not through a queue).
+    """
+    
+    def __init__(self, ctx=None):
+        ctx = ctx or multiprocessing.get_context("spawn")
+        self._cancelled = ctx.Event()
+        self._running = ctx.Event()
+        self._running.set()
+        
+    def cancel(self):
+        self._cancelled.set()
+        self._running.set()  # Wake paused conversions so they can stop
+        
+    def pause(self):
+        if not self._cancelled.is_set():
+            self._running.clear()
+            
+    def resume(self):
+        self._running.set()
+        
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+        
+    @property
+    def paused(self):
+        return not self._running.is_set()
+        
+    def check(self):
+        """Block while paused; raise Cancelled once cancelled"""
+        self._running.wait()
+        if self._cancelled.is_set():
+            raise Cancelled("Cancelled")
+
+class OutputTarget:
+    """One output layout of a job: where it goes and how sheets are arranged"""
+    
+    def __init__(self, output_path, pages_per_sheet=3, paper="A4", add_title=True,
+                 title_on_first_only=False):
+        if paper not in PAPER_SIZES:
+            raise ValueError(f"Unknown paper size '{paper}' (choose from {', '.join(PAPER_SIZES)})")
+        if pages_per_sheet not in PAGES_PER_SHEET:
+            raise ValueError(f"Unsupported pages per sheet {pages_per_sheet} "
+                             f"(choose from {', '.join(map(str, PAGES_PER_SHEET))})")
+        self.output_path = output_path
+        self.pages_per_sheet = pages_per_sheet
+        self.paper = paper
+        self.add_title = add_title
+        self.title_on_first_only = title_on_first_only
+        
+    @property
+    def pagesize(self):
+        return PAPER_SIZES[self.paper]
+        
+    @classmethod
+    def coerce(cls, target):
+        """Accept an OutputTarget or its keyword arguments as a dict (e.g. from a spool job)"""
+        return target if isinstance(target, cls) else cls(**target)
+        
+    def __repr__(self):
+        return f"<OutputTarget {self.pages_per_sheet}-up {self.paper} -> {self.output_path}>"
+
+class EncodedPage:
+    """A rendered, inverted source page compressed once and shared by every target"""
+    
+    def __init__(self, index, width, height, data, color_space="DeviceRGB", filters=("FlateDecode",)):
+        self.index = index              # 0-based source page index
+        self.width = width
+        self.height = height
+        self.data = data                # Image stream, already encoded with filters
+        self.color_space = color_space
+        self.filters = filters
+        self.name = f"slide{index}-{uuid.uuid4().hex}"
+
+class RasterPage:
+    """A rendered, inverted source page kept as an image, for sheet compositing"""
+    
+    def __init__(self, index, image):
+        self.index = index
+        self.image = image
+        self.width, self.height = image.size
+
+_sheet_fonts = {}
+
+def sheet_font(size):
+    """A TrueType font of the given pixel size for composited titles, cached"""
+    if size not in _sheet_fonts:
+        for name in ("DejaVuSans.ttf", "Arial.ttf", "arial.ttf", "Helvetica.ttc"):
+            try:
+                _sheet_fonts[size] = ImageFont.truetype(name, size)
+                break
+            except OSError:
+                continue
+        else:
+            _sheet_fonts[size] = ImageFont.load_default(size)
+    return _sheet_fonts[size]
+
+def encode_image(index, img, scale=1.0, quality=None):
+    """Encode a rendered page as an EncodedPage: lossless (Flate) or, given a quality, JPEG.
+    
+    Grayscale ("L") images are stored with one channel; scale < 1 downsamples first.
+    """
+    if scale < 1:
+        size = (max(1, round(img.width * scale)), max(1, round(img.height * scale)))
+        img = img.resize(size, Image.LANCZOS)
+    color_space = "DeviceGray" if img.mode == "L" else "DeviceRGB"
+    if quality is None:
+        return EncodedPage(index, img.width, img.height, zlib.compress(img.tobytes()), color_space)
+    buf = io.BytesIO()
+    img.save(buf, "JPEG", quality=quality)
+    return EncodedPage(index, img.width, img.height, buf.getvalue(), color_space, ("DCTDecode",))
+
+def is_near_gray(img, tolerance=8):
+    """True if no pixel of a reduced copy differs between colour channels by more than tolerance"""
+    small = img.reduce(4) if min(img.size) >= 64 else img
+    r, g, b = small.split()
+    return all(ImageChops.difference(a, b).getextrema()[1] <= tolerance
+               for a, b in ((r, g), (g, b), (r, b)))
+
+class SizeBudget:
+    """Picks the most legible encoding of each page that fits in a byte budget.
+    
+    Pages that are (nearly) gray drop to one channel first, which loses
+    nothing visible. Then encodings are tried from best to worst: lossless,
+    JPEG at falling quality, then the same at lower scales (the same as rendering at a lower
+    DPI, without re-rendering). Trials start one step above the previous
+    page's choice, so most pages take only one or two trial encodes.
+    """
+    
+    # (scale, JPEG quality or None for lossless); flat slides are often smaller
+    # lossless than as JPEG, so each scale tries lossless first
+    LADDER = ((1.0, None), (1.0, 85), (1.0, 70), (0.75, None), (0.75, 70), (0.5, None),
+              (0.5, 70), (0.5, 50), (0.35, None), (0.35, 50), (0.25, 40))
+    
+    def __init__(self, page_bytes):
+        self.page_bytes = page_bytes
+        self.sheet_level = 0      # Composited sheets walk the ladder separately
+        self.level = 0
+        self.trials = 0
+        self.missed = 0     # Pages still over budget at the lowest setting (see describe_miss)
+        
+    @staticmethod
+    def describe_miss(missed):
+        return f"{missed} pages don't fit the size limit even at the lowest quality"
+        
+    def encode(self, index, img, pages=1):
+        """Encode img, which holds the given number of pages, within their combined budget"""
+        if is_near_gray(img):
+            img = img.convert("L")
+        last_level = self.level if pages == 1 else self.sheet_level
+        level = max(0, last_level - 1)
+        while True:
+            scale, quality = self.LADDER[level]
+            page = encode_image(index, img, scale, quality)
+            self.trials += 1
+            if len(page.data) <= self.page_bytes * pages:
+                break
+            if level == len(self.LADDER) - 1:
+                self.missed += pages
+                break
+            level += 1
+        if pages == 1:
+            self.level = level
+        else:
+            self.sheet_level = level
+        return page
+
+class PrecompressedImageXObject(pdfdoc.PDFImageXObject):
+    """Image XObject whose stream was encoded up front.
+    
+    reportlab's drawImage decodes, hashes and recompresses an image for every
+    canvas it is drawn on; embedding the EncodedPage stream as-is lets any
+    number of output documents share one encode.
+    """
+    
+    def __init__(self, page):
+        super().__init__(page.name)
+        self.width, self.height = page.width, page.height
+        self.bitsPerComponent = 8
+        self.colorSpace = page.color_space
+        self.streamContent = page.data
+        self._filters = page.filters
+
+def draw_encoded_page(c, page, x, y, width, height):
+    """Draw an EncodedPage on a reportlab canvas, registering its XObject once per document.
+    
+    Mirrors the registration done by Canvas.drawImage, minus the re-encoding.
+    """
+    reg_name = c._doc.getXObjectName(page.name)
+    if reg_name not in c._doc.idToObject:
+        xobj = PrecompressedImageXObject(page)
+        c._setXObjects(xobj)
+        c._doc.Reference(xobj, reg_name)
+        c._doc.addForm(page.name, xobj)
+        
+    c._currentPageHasImages = 1
+    c.saveState()
+    c.translate(x, y)
+    c.scale(width, height)
+    c._code.append(f"/{reg_name} Do")
+    c.restoreState()
+    c._formsinuse.append(page.name)
+
+class OptimizeResult:
+    """Size and time of one optimize_pdf run"""
+    
+    def __init__(self, path, bytes_before, bytes_after, seconds, linearized):
+        self.path = path
+        self.bytes_before = bytes_before
+        self.bytes_after = bytes_after
+        self.seconds = seconds
+        self.linearized = linearized
+        
+    def __str__(self):
+        saved = 1 - self.bytes_after / self.bytes_before if self.bytes_before else 0
+        return (f"{os.path.basename(self.path)}: {format_size(self.bytes_before)} -> "
+                f"{format_size(self.bytes_after)} ({saved:.1%} smaller) in {self.seconds:.2f}s"
+                f"{', linearized' if self.linearized else ''}")
+
+def summarize_optimization(results):
+    """One line totalling several OptimizeResults, or "" if there are none"""
+    if not results:
+        return ""
+    before = sum(r.bytes_before for r in results)
+    after = sum(r.bytes_after for r in results)
+    seconds = sum(r.seconds for r in results)
+    return (f"Optimized {len(results)} files: {format_size(before)} -> {format_size(after)} "
+            f"in {seconds:.1f}s")
+
+def summarize_fidelity(checked, flagged):
+    """One line about a verified batch, or "" if nothing was checked"""
+    if not checked:
+        return ""
+    if not flagged:
+        return f"Verified {checked} slides: all legible"
+    return f"Verified {checked} slides: {len(flagged)} may be illegible"
+
+def optimize_pdf(path):
+    """Rewrite a PDF in place without unused objects and with compressed object streams.
+    
+    With pikepdf installed the result is also linearized, so viewers and
+    printers can show the first page before the rest has arrived. MuPDF no
+    longer linearizes, so without pikepdf the file is only compacted, and the
+    original is kept if that doesn't make it smaller.
+    """
+    started = time.perf_counter()
+    bytes_before = os.path.getsize(path)
+    tmp_path = path + ".opt"
+    try:
+        if pikepdf is not None:
+            with pikepdf.open(path) as pdf:
+                pdf.remove_unreferenced_resources()
+                pdf.save(tmp_path, linearize=True, compress_streams=True,
+                         object_stream_mode=pikepdf.ObjectStreamMode.generate)
+            linearized = True
+        else:
+            with fitz.open(path) as doc:
+                doc.save(tmp_path, garbage=4, deflate=True, use_objstms=1)
+            linearized = False
+            
+        if linearized or os.path.getsize(tmp_path) < bytes_before:
+            os.replace(tmp_path, path)
+        else:
+            os.remove(tmp_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return OptimizeResult(path, bytes_before, os.path.getsize(path),
+                          time.perf_counter() - started, linearized)
+
+def _box_mean(x, size):
+    """Mean over every size x size window (valid positions only), from an integral image"""
+    integral = np.pad(x, ((1, 0), (1, 0))).cumsum(0).cumsum(1)
+    total = (integral[size:, size:] - integral[:-size, size:]
+             - integral[size:, :-size] + integral[:-size, :-size])
+    return total / (size * size)
+
+def ssim(a, b, window=7, detail=25):
+    """Structural similarity of two equally sized grayscale arrays (0..255), from 0 to 1.
+    
+    Both images get a light 3x3 blur first, so sub-pixel differences in where
+    a slide was placed don't count as damage. The score is averaged over the
+    windows that hold detail (variance above detail) - text and drawings -
+    so large flat backgrounds can't hide an unreadable slide.
+    """
+    a = _box_mean(a.astype(np.float64), 3)
+    b = _box_mean(b.astype(np.float64), 3)
+    window = min(window, *a.shape)
+    c1, c2 = (0.01 * 255) ** 2, (0.03 * 255) ** 2
+    
+    mu_a, mu_b = _box_mean(a, window), _box_mean(b, window)
+    var_a = _box_mean(a * a, window) - mu_a ** 2
+    var_b = _box_mean(b * b, window) - mu_b ** 2
+    cov = _box_mean(a * b, window) - mu_a * mu_b
+    score = ((2 * mu_a * mu_b + c1) * (2 * cov + c2)) / \
+            ((mu_a ** 2 + mu_b ** 2 + c1) * (var_a + var_b + c2))
+    busy = np.maximum(var_a, var_b) > detail
+    return float(score[busy].mean() if busy.any() else score.mean())
+
+class SlideScore:
+    """Similarity of one source page to where it was printed"""
+    
+    def __init__(self, layout, sheet, page, score):
+        self.layout = layout    # e.g. "3-up A4"
+        self.sheet = sheet      # 1-based output sheet
+        self.page = page        # 1-based source page
+        self.score = score
+        
+    def __str__(self):
+        return f"page {self.page} on sheet {self.sheet} ({self.layout}): {self.score:.2f}"
+
+class FidelityChecker:
+    """Checks that every slide is still legible in the output.
+    
+    Each source page and the region of the output sheet it was drawn in are
+    rendered in grayscale at a low resolution (width pixels across), the
+    source is inverted like the output, and the two are compared with SSIM.
+    Slides scoring below threshold are flagged. Rendering at thumbnail size
+    keeps this cheap enough to run on every batch, while lost text, heavy
+    compression artefacts or misplaced slides still pull the score down.
+    """
+    
+    # Pixels the printed slide may be offset by (rasterised output snaps slides to its pixel grid)
+    SHIFT = 1
+    
+    def __init__(self, threshold=0.8, width=256):
+        if np is None:
+            raise RuntimeError("Fidelity checking needs numpy (pip install numpy)")
+        self.threshold = threshold
+        self.width = width
+        self.seconds = 0.0    # Time spent in check(), so callers can leave it out of timings
+        
+    def _gray(self, page, clip=None):
+        rect = clip or page.rect
+        zoom = self.width / rect.width
+        # Map the clip's corner to pixel (0, 0) exactly, so it lines up with the source render
+        matrix = fitz.Matrix(zoom, 0, 0, zoom, -rect.x0 * zoom, -rect.y0 * zoom)
+        pix = page.get_pixmap(matrix=matrix, clip=clip, colorspace=fitz.csGRAY, alpha=False)
+        gray = np.frombuffer(pix.samples, dtype=np.uint8).reshape(pix.height, pix.stride)[:, :pix.width]
+        if clip is None:
+            return gray
+            
+        # MuPDF renders only the part on the sheet, rounded out to whole pixels:
+        # put it where it belongs in the clip, with blank paper around it
+        full = np.full((round(clip.height * zoom), round(clip.width * zoom)), 255, dtype=np.uint8)
+        dy, dx = pix.y, pix.x
+        src = gray[max(0, -dy):, max(0, -dx):]
+        dst = full[max(0, dy):, max(0, dx):]
+        rows, cols = min(src.shape[0], dst.shape[0]), min(src.shape[1], dst.shape[1])
+        dst[:rows, :cols] = src[:rows, :cols]
+        return full
+        
+    def check(self, source, output_path, placements):
+        """Score every placement: (layout, sheet_index, source_index, (x, y, w, h)) in points"""
+        started = time.perf_counter()
+        scores = []
+        with open_pdf(source) as src, fitz.open(output_path) as out:
+            for layout, sheet, src_idx, (x, y, w, h) in placements:
+                page = out[sheet]
+                # Placements are measured from the bottom left, MuPDF from the top left
+                top = page.rect.height - (y + h)
+                printed = self._gray(page, fitz.Rect(x, top, x + w, top + h))
+                original = 255 - self._gray(src[src_idx])
+                score = self._best_score(printed, original)
+                scores.append(SlideScore(layout, sheet + 1, src_idx + 1, score))
+        self.seconds += time.perf_counter() - started
+        return scores
+        
+    def _best_score(self, printed, original):
+        # Compare the source without its border against the printed slide; only
+        # slides that fail are retried shifted by up to SHIFT pixels each way
+        k = self.SHIFT
+        rows = min(printed.shape[0], original.shape[0]) - 2 * k
+        cols = min(printed.shape[1], original.shape[1]) - 2 * k
+        if rows <= 0 or cols <= 0:
+            return 0.0
+        inner = original[k:k + rows, k:k + cols]
+        score = ssim(printed[k:k + rows, k:k + cols], inner)
+        if score >= self.threshold:
+            return score
+        return max([score] + [ssim(printed[k + dy:k + dy + rows, k + dx:k + dx + cols], inner)
+                              for dy in range(-k, k + 1) for dx in range(-k, k + 1) if dy or dx])
+        
+    def flagged(self, scores):
+        return [s for s in scores if s.score < self.threshold]
+
+class PDFProcessor:
+    """Lays out inverted slides several to a sheet"""
+    
+    # Estimated bytes of a file and of each sheet besides the images (titles, page objects)
+    FILE_OVERHEAD = 4096
+    SHEET_OVERHEAD = 1024
+    
+    # Below this many pages per render worker, process start-up costs more than it saves
+    MIN_PAGES_PER_RENDER_WORKER = 8
+    
+    def __init__(self, input_path, output_path, skip_first=True, add_title=True, 
+                 title_on_first_only=False, pages_per_sheet=3, render_scale=2, max_sheets=None,
+                 render_workers=1, paper="A4", targets=None, optimize=False,
+                 max_sheet_bytes=None, max_file_bytes=None, composite_dpi=None, cancel_token=None,
+                 verify=False):
+        # A file path, zip member ("archive.zip::member.pdf"), PDF bytes or binary file object
+        self.input_path = input_path
+        self.source = input_path    # What open_pdf can reopen the input from
+        self.output_path = output_path
+        self.skip_first = skip_first
+        self.add_title = add_title
+        self.title_on_first_only = title_on_first_only
+        self.pages_per_sheet = pages_per_sheet
+        self.render_scale = render_scale
+        self.max_sheets = max_sheets
+        self.render_workers = render_workers
+        self.optimize = optimize    # Finish each output with optimize_pdf
+        self.optimized = []
+        # Size budget the pages are encoded to fit (see SizeBudget)
+        self.max_sheet_bytes = max_sheet_bytes
+        self.max_file_bytes = max_file_bytes
+        self.budget = None
+        if composite_dpi and np is None:
+            raise RuntimeError("Sheet compositing needs numpy (pip install numpy)")
+        self.composite_dpi = composite_dpi  # Embed each sheet as one raster at this resolution
+        self.cancel_token = cancel_token    # Checked before every page, to pause or stop
+        # With verify, process() scores every output slide into fidelity
+        self.checker = FidelityChecker() if verify else None
+        self.placements = {}    # target -> [(layout, sheet, source_index, rect)] when verifying
+        self.fidelity = []
+        
+        # Without explicit targets the layout options above describe the only one
+        if targets:
+            self.targets = [OutputTarget.coerce(t) for t in targets]
+        else:
+            self.targets = [OutputTarget(output_path, pages_per_sheet, paper, add_title,
+                                         title_on_first_only)]
+
+    def _render_page(self, doc, src_idx):
+        """Render and invert one source page"""
+        page = doc.load_page(src_idx)
+        pix = page.get_pixmap(matrix=fitz.Matrix(self.render_scale, self.render_scale), alpha=False)
+        img = Image.frombytes("RGB", (pix.width, pix.height), pix.samples)
+        return ImageOps.invert(img)
+
+    def _iter_page_images(self, doc, indices):
+        """Yield (page_index, image) for the given pages in order, in parallel when worthwhile"""
+        workers = min(self.render_workers, len(indices) // self.MIN_PAGES_PER_RENDER_WORKER)
+        # Render workers reopen the file, so in-memory inputs are rendered here
+        if workers > 1 and isinstance(self.input_path, str):
+            renderer = ParallelPageRenderer(workers, self.render_scale)
+            yield from renderer.iter_images(doc, self.input_path, indices)
+        else:
+            for src_idx in indices:
+                yield src_idx, self._render_page(doc, src_idx)
+
+    def _open_document(self):
+        """Open the input: a path, a zip member, PDF bytes or a binary file-like object.
+        
+        Returns the document and a display name used for errors and the title fallback.
+        """
+        source = self.input_path
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            # Named like its output file and in the failure list
+            return fitz.open(stream=bytes(source), filetype="pdf"), input_name(source)
+        if hasattr(source, "read"):
+            name = getattr(source, "name", None)
+            name = os.path.basename(name) if isinstance(name, str) else "Untitled.pdf"
+            # The stream can only be read once; the fidelity check reopens the bytes
+            self.source = source.read()
+            return fitz.open(stream=self.source, filetype="pdf"), name
+        return open_pdf(source), input_name(source)
+
+    def process(self, progress_callback=None):
+        """Write every target's output file and return the number of sheets written"""
+        canvases = {}
+        
+        def canvas_for_sheet(target, output_page):
+            if target not in canvases:
+                canvases[target] = canvas.Canvas(target.output_path, pagesize=target.pagesize)
+            return canvases[target]
+            
+        sheets = 0
+        for _ in self._draw_sheets(canvas_for_sheet, progress_callback):
+            sheets += 1
+        
+        # Finish and save PDF
+        for c in canvases.values():
+            c.save()
+            
+        if self.optimize:
+            for target in canvases:
+                if isinstance(target.output_path, str):
+                    self.optimized.append(optimize_pdf(target.output_path))
+        if self.checker is not None:
+            for target in canvases:
+                if isinstance(target.output_path, str):
+                    self.fidelity.extend(self.checker.check(self.source, target.output_path,
+                                                            self.placements.get(target, [])))
+        return sheets
+
+    def iter_sheets(self, progress_callback=None):
+        """Yield each output sheet as a Sheet (a one-page PDF) as soon as it is finished.
+        
+        The output paths are not used; callers can stream sheets to a printer,
+        a socket or storage while the rest of the deck is still rendering.
+        With several targets, sheets of all targets are yielded as they complete.
+        """
+        buffers = {}
+        
+        def new_canvas(target, output_page):
+            buffers[target, output_page] = io.BytesIO()
+            return canvas.Canvas(buffers[target, output_page], pagesize=target.pagesize)
+            
+        started = time.perf_counter()
+        for target, c, output_page, output_page_count, pages in \
+                self._draw_sheets(new_canvas, progress_callback):
+            c.save()
+            pdf_bytes = buffers.pop((target, output_page)).getvalue()
+            now = time.perf_counter()
+            yield Sheet(output_page, output_page_count, pages, pdf_bytes, now - started, target)
+            started = time.perf_counter()
+
+    def _encode_page(self, src_idx, img):
+        """Compress a rendered page once so every target can embed it"""
+        if self.composite_dpi:
+            return RasterPage(src_idx, img.copy())  # Composited per sheet instead
+        if self.budget is not None:
+            return self.budget.encode(src_idx, img)
+        return encode_image(src_idx, img)
+        
+    def _page_budget(self, total_pages):
+        """Bytes each page may take to meet the size limits, or None without limits"""
+        limits = []
+        # Pages are shared by all targets, so the densest layout sets the limit
+        for target in self.targets:
+            if self.max_sheet_bytes:
+                limits.append((self.max_sheet_bytes - self.SHEET_OVERHEAD) / target.pages_per_sheet)
+            if self.max_file_bytes:
+                sheets = ceil(total_pages / target.pages_per_sheet)
+                images = self.max_file_bytes - self.FILE_OVERHEAD - sheets * self.SHEET_OVERHEAD
+                limits.append(images / total_pages)
+        return max(0, int(min(limits))) if limits else None
+
+    def _draw_sheets(self, canvas_for_sheet, progress_callback=None):
+        """Render each source page once and draw it into every target's current sheet.
+        
+        canvas_for_sheet(target, output_page) supplies the canvas for a sheet;
+        after a sheet is drawn (and its page closed with showPage) this yields
+        (target, canvas, output_page, output_page_count, source_page_numbers).
+        """
+        # Open PDF and get Title metadata or fallback to filename
+        doc, name = self._open_document()
+        try:
+            raw_title = (doc.metadata or {}).get("title", "").strip()
+            title = raw_title or os.path.splitext(name)[0]
+
+            # Calculate starting page and total pages to process
+            start_page = 1 if self.skip_first else 0
+            total_pages = doc.page_count - start_page
+            
+            if total_pages <= 0:
+                raise ValueError(f"'{name}' has no pages to process.")
+
+            # Per target: sheets in the full output, and the pages it needs
+            # (only the first few sheets' worth when max_sheets is set, e.g. for a preview)
+            layouts = {}
+            for target in self.targets:
+                output_page_count = ceil(total_pages / target.pages_per_sheet)
+                sheets_to_write = output_page_count
+                if self.max_sheets is not None:
+                    sheets_to_write = min(output_page_count, self.max_sheets)
+                target_pages = min(total_pages, sheets_to_write * target.pages_per_sheet)
+                layouts[target] = (output_page_count, target_pages)
+                
+            render_pages = max(pages for _, pages in layouts.values())
+            # Budgets are based on the full output, so a preview shows the same encoding
+            page_budget = self._page_budget(total_pages)
+            self.budget = SizeBudget(page_budget) if page_budget is not None else None
+            pending = {target: [] for target in self.targets}
+            sheet_index = {target: 0 for target in self.targets}
+            
+            images = self._iter_page_images(doc, range(start_page, start_page + render_pages))
+            try:
+                for src_idx, img in images:
+                    if self.cancel_token is not None:
+                        self.cancel_token.check()
+                    page = self._encode_page(src_idx, img)
+                    position = src_idx - start_page + 1
+                    
+                    for target in self.targets:
+                        output_page_count, target_pages = layouts[target]
+                        if position > target_pages:
+                            continue
+                        pending[target].append(page)
+                        if len(pending[target]) < target.pages_per_sheet and position < target_pages:
+                            continue
+                            
+                        # This target's sheet is full (or the pages ran out): draw it
+                        output_page = sheet_index[target]
+                        c = canvas_for_sheet(target, output_page)
+                        self._draw_sheet(c, target, title, output_page, output_page_count,
+                                         pending[target])
+                        c.showPage()
+                        sheet_numbers = [p.index + 1 for p in pending[target]]
+                        pending[target] = []
+                        sheet_index[target] += 1
+                        yield target, c, output_page, output_page_count, sheet_numbers
+                        
+                    # Update progress
+                    if progress_callback:
+                        progress_callback(position, render_pages)
+            finally:
+                images.close()
+        finally:
+            doc.close()
+
+    def _sheet_layout(self, target, title, output_page, output_page_count, pages):
+        """Place a sheet's title and pages, in points from the bottom left.
+        
+        Returns (title_text, placements): title_text is None when the sheet
+        has no title, and placements lists (page, x, y, width, height).
+        """
+        width_pt, height_pt = target.pagesize
+        
+        # Set up page layout
+        margin = 20 * mm
+        y_cursor = height_pt - margin
+        title_text = None
+        
+        # Add title if requested
+        should_add_title = target.add_title and (output_page == 0 or not target.title_on_first_only)
+        if should_add_title:
+            # Truncate title if too long
+            max_title_width = width_pt - 2 * margin
+            title_text = f"{title} - Sheet {output_page + 1}/{output_page_count}"
+            
+            # Measure text width and truncate if needed
+            text_width = pdfmetrics.stringWidth(title_text, "Helvetica", 9)
+            if text_width > max_title_width:
+                # Calculate how many characters we can fit
+                char_width = text_width / len(title_text)
+                max_chars = int(max_title_width / char_width) - 3  # -3 for ellipsis
+                truncated_title = title[:max_chars] + "..."
+                title_text = f"{truncated_title} - Sheet {output_page + 1}/{output_page_count}"
+        else:
+            y_cursor = height_pt - 10 * mm  # Less margin if no title
+        
+        # Calculate section height based on number of images on this page
+        section_h = (y_cursor - 10 * mm) / len(pages)
+        
+        placements = []
+        for page in pages:
+            # Scale to fit width and section height
+            scale = min((width_pt - 2*margin) / page.width, section_h / page.height)
+            w, h = page.width * scale, page.height * scale
+            x = (width_pt - w) / 2
+            y = y_cursor - h
+            placements.append((page, x, y, w, h))
+            
+            # Move cursor down for next image
+            y_cursor = y - 5 * mm
+        return title_text, placements
+        
+    def _draw_sheet(self, c, target, title, output_page, output_page_count, pages):
+        """Draw one sheet: the title line and the given pages"""
+        width_pt, height_pt = target.pagesize
+        margin = 20 * mm
+        title_text, placements = self._sheet_layout(target, title, output_page,
+                                                    output_page_count, pages)
+        if self.checker is not None:
+            layout = f"{target.pages_per_sheet}-up {target.paper}"
+            self.placements.setdefault(target, []).extend(
+                (layout, output_page, page.index, (x, y, w, h)) for page, x, y, w, h in placements)
+        if self.composite_dpi:
+            sheet = self._composite_sheet(target, title_text, placements, output_page)
+            draw_encoded_page(c, sheet, 0, 0, width_pt, height_pt)
+            return
+            
+        if title_text is not None:
+            c.setFont("Helvetica", 9)
+            c.drawString(20 * mm, height_pt - margin + 5 * mm, title_text)
+        
+        # Place each page on this output sheet
+        for page, x, y, w, h in placements:
+            # Draw the image
+            draw_encoded_page(c, page, x, y, w, h)
+            
+            # Add page number
+            c.setFont("Helvetica", 8)
+            c.drawString(width_pt - margin - 20, y, f"Page {page.index + 1}")
+            
+    def _composite_sheet(self, target, title_text, placements, output_page):
+        """Paint a whole sheet into one raster at composite_dpi and encode it"""
+        width_pt, height_pt = target.pagesize
+        margin = 20 * mm
+        zoom = self.composite_dpi / 72
+        width_px, height_px = round(width_pt * zoom), round(height_pt * zoom)
+        sheet = np.full((height_px, width_px, 3), 255, dtype=np.uint8)
+        
+        def to_px(x, y):
+            """Points from the bottom left to pixels from the top left"""
+            return round(x * zoom), round((height_pt - y) * zoom)
+            
+        labels = []
+        for page, x, y, w, h in placements:
+            left, top = to_px(x, y + h)
+            # Resample straight to the printed size, so the printer has nothing left to scale
+            resized = page.image.resize((round(w * zoom), round(h * zoom)), Image.LANCZOS)
+            # Whatever runs off the sheet is cut off, as in vector output
+            visible = resized.crop((max(0, -left), max(0, -top), min(resized.width, width_px - left),
+                                    min(resized.height, height_px - top)))
+            left, top = max(0, left), max(0, top)
+            sheet[top:top + visible.height, left:left + visible.width] = np.asarray(visible)
+            resized.close()
+            labels.append((to_px(width_pt - margin - 20, y), f"Page {page.index + 1}", 8))
+        if title_text is not None:
+            labels.append((to_px(20 * mm, height_pt - margin + 5 * mm), title_text, 9))
+            
+        img = Image.fromarray(sheet)
+        draw = ImageDraw.Draw(img)
+        for position, text, size in labels:
+            draw.text(position, text, fill=(0, 0, 0), font=sheet_font(round(size * zoom)),
+                      anchor="ls")
+        if self.budget is not None:
+            return self.budget.encode(output_page, img, pages=len(placements))
+        return encode_image(output_page, img.convert("L") if is_near_gray(img) else img)
+
+class Sheet:
+    """One finished output sheet yielded by PDFProcessor.iter_sheets"""
+    
+    def __init__(self, index, count, pages, pdf_bytes, seconds, target=None):
+        self.index = index          # 0-based sheet number
+        self.count = count          # Total sheets in the output
+        self.pages = pages          # 1-based source page numbers on this sheet
+        self.pdf_bytes = pdf_bytes  # The sheet as a one-page PDF
+        self.seconds = seconds      # Time spent rendering and drawing this sheet
+        self.target = target        # The OutputTarget this sheet belongs to
+        
+    @property
+    def size(self):
+        return len(self.pdf_bytes)
+        
+    def open(self):
+        """Open the sheet as a PyMuPDF document, e.g. for Document.insert_pdf"""
+        return fitz.open(stream=self.pdf_bytes, filetype="pdf")
+        
+    def __repr__(self):
+        return (f"<Sheet {self.index + 1}/{self.count} pages={self.pages} "
+                f"bytes={self.size} seconds={self.seconds:.2f}>")
+
+class LRUCache:
+    """Small thread-safe least-recently-used mapping"""
+    
+    def __init__(self, capacity=64):
+        self.capacity = capacity
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+        
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self._items:
+                return default
+            self._items.move_to_end(key)
+            return self._items[key]
+            
+    def put(self, key, value):
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.capacity:
+                self._items.popitem(last=False)
+                
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            
+    def __len__(self):
+        return len(self._items)
+
+class PreviewProcessor(PDFProcessor):
+    """PDFProcessor that reuses already-rendered source pages from a shared cache"""
+    
+    def __init__(self, *args, page_cache, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.page_cache = page_cache
+        
+    def _render_page(self, doc, src_idx):
+        # Key on mtime too so an edited file is re-rendered
+        key = (self.input_path, input_mtime(self.input_path), src_idx, self.render_scale)
+        img = self.page_cache.get(key)
+        if img is None:
+            img = super()._render_page(doc, src_idx)
+            self.page_cache.put(key, img)
+        return img
+
+class PreviewRenderer:
+    """Renders the first output sheets of a file at screen resolution on a background thread.
+    
+    Requests are debounced on the Tk loop; the worker always renders the most
+    recent request and drops results that were superseded while rendering.
+    Finished sheets are published as PNG data on the "preview" topic.
+    """
+    
+    def __init__(self, master, channel, sheets=2, width=360, debounce_ms=250, render_scale=0.5):
+        self.master = master
+        self.channel = channel
+        self.sheets = sheets
+        self.width = width
+        self.debounce_ms = debounce_ms
+        self.render_scale = render_scale
+        self.page_cache = LRUCache(capacity=48)
+        
+        self._after_id = None
+        self._generation = 0
+        self._request = None
+        self._cond = threading.Condition()
+        threading.Thread(target=self._worker, daemon=True).start()
+        
+    def request(self, input_path, options):
+        """Schedule a preview; rapid successive calls collapse into one render"""
+        if self._after_id is not None:
+            self.master.after_cancel(self._after_id)
+        self._after_id = self.master.after(
+            self.debounce_ms, lambda: self._submit(input_path, dict(options)))
+        
+    def cancel(self):
+        """Drop any scheduled or running preview"""
+        if self._after_id is not None:
+            self.master.after_cancel(self._after_id)
+            self._after_id = None
+        with self._cond:
+            self._generation += 1
+            self._request = None
+            
+    def _submit(self, input_path, options):
+        self._after_id = None
+        with self._cond:
+            self._generation += 1
+            self._request = (self._generation, input_path, options)
+            self._cond.notify()
+            
+    def _worker(self):
+        while True:
+            with self._cond:
+                while self._request is None:
+                    self._cond.wait()
+                generation, input_path, options = self._request
+                self._request = None
+                
+            try:
+                sheets = self.render(input_path, options)
+                error = None
+            except Exception as e:
+                sheets, error = [], str(e)
+                
+            with self._cond:
+                current = generation == self._generation
+            if current:
+                self.channel.publish("preview", sheets, error)
+                
+    def render(self, input_path, options):
+        """Return PNG data for the first output sheets of input_path"""
+        if options.get("composite_dpi"):
+            # Compositing at print resolution only to shrink it to the preview is wasted work
+            paper_width = min(PAPER_SIZES.get(options.get("paper"), A4))
+            screen_dpi = ceil(self.width * 72 / paper_width)
+            options = dict(options, composite_dpi=min(options["composite_dpi"], screen_dpi))
+        buf = io.BytesIO()
+        processor = PreviewProcessor(input_path, buf, page_cache=self.page_cache,
+                                     render_scale=self.render_scale, max_sheets=self.sheets,
+                                     **options)
+        
+        sheets = []
+        with FITZ_LOCK:
+            processor.process()
+            with fitz.open(stream=buf.getvalue(), filetype="pdf") as out:
+                for page in out:
+                    zoom = self.width / page.rect.width
+                    pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), alpha=False)
+                    sheets.append(pix.tobytes("png"))
+        return sheets
+
+class PDFInfo:
+    """Pre-scan result for one input file"""
+    
+    def __init__(self, path, page_count=0, title="", encrypted=False, page_sizes=(), error=None):
+        self.path = path
+        self.page_count = page_count
+        self.title = title
+        self.encrypted = encrypted
+        self.page_sizes = page_sizes  # Distinct (width, height) in points, most common first
+        self.error = error
+        
+    @property
+    def valid(self):
+        return self.error is None
+        
+    def sheet_count(self, skip_first=True, pages_per_sheet=3):
+        """Number of output sheets PDFProcessor will write with these options"""
+        pages = self.page_count - (1 if skip_first else 0)
+        return ceil(pages / pages_per_sheet) if pages > 0 else 0
+        
+    def describe(self, skip_first=True, pages_per_sheet=3):
+        if not self.valid:
+            return self.error
+        text = f"{self.page_count} pages · {self.sheet_count(skip_first, pages_per_sheet)} sheets"
+        if self.page_sizes:
+            w, h = self.page_sizes[0]
+            text += f" · {w:.0f}×{h:.0f} pt"
+        if self.encrypted:
+            text += " · encrypted"
+        return text
+
+# Separates a zip archive from a PDF inside it: "lectures.zip::week1/notes.pdf"
+ZIP_MEMBER_SEPARATOR = "::"
+
+def split_zip_member(source):
+    """Return (archive, member) for a zip member spec, or (source, None) for anything else"""
+    if isinstance(source, str) and ZIP_MEMBER_SEPARATOR in source:
+        archive, member = source.split(ZIP_MEMBER_SEPARATOR, 1)
+        return archive, member.replace("\\", "/")
+    return source, None
+
+def open_pdf(source):
+    """Open a path, zip member spec or PDF bytes with MuPDF.
+    
+    Zip members are decompressed into memory and opened from there, so
+    archives never have to be extracted to disk.
+    """
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return fitz.open(stream=bytes(source), filetype="pdf")
+    archive, member = split_zip_member(source)
+    if member is None:
+        return fitz.open(source)
+    with zipfile.ZipFile(archive) as zf:
+        data = zf.read(member)
+    return fitz.open(stream=data, filetype="pdf")
+
+def input_name(source):
+    """File name of an input for titles, outputs and messages"""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return "stdin.pdf"
+    archive, member = split_zip_member(source)
+    return os.path.basename(member or archive)
+
+def _output_parts(source):
+    """Path components naming a source's output, the file name last"""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return ["stdin.pdf"]
+    archive, member = split_zip_member(source)
+    parts = [part for part in os.path.abspath(archive).split(os.sep) if part]
+    if member is not None:
+        # The archive acts as a folder; ".." and absolute member names can't leave it
+        parts[-1] = os.path.splitext(parts[-1])[0]
+        parts.extend(part for part in member.split("/") if part not in ("", ".", ".."))
+    return parts
+
+def output_names(sources):
+    """Relative output paths for a batch of sources, one per source and all different.
+    
+    Each output is named after its input file; inputs with the same name
+    (say week1/notes.pdf and week2/notes.pdf from a folder import or inside
+    one zip archive) keep as many parent folders as it takes to tell them apart.
+    """
+    parts = [_output_parts(source) for source in sources]
+    depth = [1] * len(parts)
+    while True:
+        names = [os.path.join(*p[-d:]) for p, d in zip(parts, depth)]
+        groups = {}
+        for i, name in enumerate(names):
+            groups.setdefault(os.path.normcase(name), []).append(i)
+        grew = False
+        for ids in groups.values():
+            # The same input given twice never gets apart; it is numbered below
+            if len({tuple(parts[i]) for i in ids}) < 2:
+                continue
+            for i in ids:
+                if depth[i] < len(parts[i]):
+                    depth[i] += 1
+                    grew = True
+        if not grew:
+            break
+            
+    # Only the same input given twice is left; number the copies
+    seen = {}
+    for i, name in enumerate(names):
+        key = os.path.normcase(name)
+        seen[key] = seen.get(key, 0) + 1
+        if seen[key] > 1:
+            stem, ext = os.path.splitext(name)
+            names[i] = f"{stem}_{seen[key]}{ext}"
+    return names
+
+def input_key(source):
+    """Normalized spelling of a path or zip member spec, for spotting the same input twice"""
+    archive, member = split_zip_member(source)
+    key = os.path.normcase(os.path.abspath(archive))
+    return key if member is None else f"{key}{ZIP_MEMBER_SEPARATOR}{member}"
+
+def input_mtime(source):
+    """Modification time of an input (of its archive for zip members)"""
+    return os.path.getmtime(split_zip_member(source)[0])
+
+def find_zip_pdfs(archive):
+    """Member specs of the PDFs inside a zip archive, in archive order"""
+    with zipfile.ZipFile(archive) as zf:
+        names = [info.filename for info in zf.infolist() if not info.is_dir()]
+    return [f"{archive}{ZIP_MEMBER_SEPARATOR}{name}" for name in names
+            if name.lower().endswith(".pdf") and not name.startswith("__MACOSX/")]
+
+def expand_input(path):
+    """The PDFs an input stands for: a folder's PDFs, a zip's members or the path itself"""
+    if os.path.isdir(path):
+        return list(find_pdfs(path))
+    if path.lower().endswith(".zip") and zipfile.is_zipfile(path):
+        return find_zip_pdfs(path)
+    return [path]
+
+def scan_pdf(path, skip_first=True):
+    """Read page count, title, encryption and page sizes without rendering anything.
+    
+    path may also be a zip member spec or PDF bytes.
+    """
+    try:
+        doc = open_pdf(path)
+    except Exception as e:
+        return PDFInfo(path, error=f"Cannot open: {e}")
+        
+    with doc:
+        if doc.needs_pass:
+            return PDFInfo(path, encrypted=True, error="Password protected")
+            
+        sizes = {}
+        for page in doc:
+            size = (round(page.rect.width, 1), round(page.rect.height, 1))
+            sizes[size] = sizes.get(size, 0) + 1
+        info = PDFInfo(
+            path,
+            page_count=doc.page_count,
+            title=(doc.metadata or {}).get("title", "").strip(),
+            encrypted=doc.is_encrypted,
+            page_sizes=tuple(sorted(sizes, key=sizes.get, reverse=True)),
+        )
+        
+    if info.page_count == 0:
+        info.error = "Has no pages"
+    elif info.sheet_count(skip_first) == 0:
+        info.error = "No pages left after skipping the first page"
+    return info
+
+def find_pdfs(folder):
+    """Recursively yield PDF paths (and PDFs inside zip archives) under folder in a stable order"""
+    for root, dirs, files in os.walk(folder):
+        dirs.sort()
+        for name in sorted(files):
+            if name.lower().endswith(".pdf"):
+                yield os.path.join(root, name)
+            elif name.lower().endswith(".zip"):
+                try:
+                    yield from find_zip_pdfs(os.path.join(root, name))
+                except (zipfile.BadZipFile, OSError):
+                    pass  # Not a readable archive; skip it like any other non-PDF file
+
+class ZipOutput:
+    """Collects finished output files into a zip archive as each job completes.
+    
+    Outputs are written to a staging folder next to the archive and moved in
+    one by one, so only the files in flight ever sit on disk. PDFs are stored
+    without recompression, as their streams are already compressed.
+    """
+    
+    def __init__(self, zip_path):
+        self.zip_path = zip_path
+        folder = os.path.dirname(os.path.abspath(zip_path))
+        os.makedirs(folder, exist_ok=True)
+        self.staging_dir = tempfile.mkdtemp(prefix=".slide2print-", dir=folder)
+        self.zip = zipfile.ZipFile(zip_path + ".part", "w", zipfile.ZIP_STORED)
+        self.names = set()
+        
+    def add(self, path):
+        """Move a finished output into the archive, under its path below staging_dir"""
+        name = os.path.relpath(path, self.staging_dir).replace(os.sep, "/")
+        if name in self.names:
+            raise ValueError(f"{name} is already in {os.path.basename(self.zip_path)}")
+        self.zip.write(path, name)
+        self.names.add(name)
+        os.remove(path)
+        
+    def close(self, keep=True):
+        """Finish the archive (or discard it) and remove the staging folder"""
+        self.zip.close()
+        if keep:
+            os.replace(self.zip_path + ".part", self.zip_path)
+        else:
+            os.remove(self.zip_path + ".part")
+        shutil.rmtree(self.staging_dir, ignore_errors=True)
+
+class PreScanner:
+    """Discovers and pre-scans input PDFs in the background.
+    
+    Small selections are scanned on the scanner thread; larger ones are
+    spread over a process pool. Progress is published as ("scan", done, total)
+    and the final list of PDFInfo as ("scan_done", infos).
+    """
+    
+    PARALLEL_THRESHOLD = 8
+    
+    def __init__(self, channel, max_workers=None):
+        self.channel = channel
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._generation = 0
+        
+    def scan(self, paths=(), folders=(), skip_first=True):
+        """Start scanning files and (recursively) folders; supersedes any running scan"""
+        self._generation += 1
+        threading.Thread(target=self._run, args=(self._generation, list(paths), list(folders), skip_first),
+                         daemon=True).start()
+        
+    def cancel(self):
+        self._generation += 1
+        
+    def _run(self, generation, paths, folders, skip_first):
+        # Zip archives stand for the PDFs inside them
+        expanded = []
+        for path in paths:
+            try:
+                expanded.extend(expand_input(path) if path.lower().endswith(".zip") else [path])
+            except (zipfile.BadZipFile, OSError):
+                expanded.append(path)  # Rejected with a reason by scan_pdf
+                
+        # A file picked directly and again through a folder may be spelled differently
+        paths, seen = [], set()
+        for path in expanded:
+            if input_key(path) not in seen:
+                seen.add(input_key(path))
+                paths.append(path)
+        for folder in folders:
+            for path in find_pdfs(folder):
+                if generation != self._generation:
+                    return
+                key = input_key(path)
+                if key not in seen:
+                    seen.add(key)
+                    paths.append(path)
+                    self.channel.publish("scan", 0, len(paths))
+                    
+        infos = []
+        if len(paths) < self.PARALLEL_THRESHOLD or self.max_workers == 1:
+            for path in paths:
+                with FITZ_LOCK:
+                    infos.append(scan_pdf(path, skip_first))
+                if generation != self._generation:
+                    return
+                self.channel.publish("scan", len(infos), len(paths))
+        else:
+            # Spawned workers don't inherit the Tk process state
+            ctx = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(max_workers=min(self.max_workers, len(paths)),
+                                     mp_context=ctx) as pool:
+                chunksize = max(1, len(paths) // (self.max_workers * 4))
+                for info in pool.map(scan_pdf, paths, [skip_first] * len(paths), chunksize=chunksize):
+                    infos.append(info)
+                    if generation != self._generation:
+                        pool.shutdown(wait=False, cancel_futures=True)
+                        return
+                    self.channel.publish("scan", len(infos), len(paths))
+                    
+        if generation == self._generation:
+            self.channel.publish("scan_done", infos)
+
+def format_size(size):
+    """Format a byte count as B, KB, MB or GB"""
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+def parse_size(text):
+    """Parse a byte count such as 800000, 500K, 10M or 1.5GB"""
+    text = text.strip().upper().rstrip("B")
+    factor = 1
+    if text and text[-1] in "KMG":
+        factor = 1024 ** ("KMG".index(text[-1]) + 1)
+        text = text[:-1]
+    try:
+        return int(float(text) * factor)
+    except ValueError:
+        raise ValueError(f"Bad size '{text}': expected e.g. 500K or 10M")
+
+def format_duration(seconds):
+    """Format seconds as m:ss or h:mm:ss"""
+    seconds = int(round(seconds))
+    hours, rest = divmod(seconds, 3600)
+    minutes, secs = divmod(rest, 60)
+    return f"{hours}:{minutes:02d}:{secs:02d}" if hours else f"{minutes}:{secs:02d}"
+
+class ThroughputHistory:
+    """Per-machine record of measured conversion speed, kept in a small SQLite database"""
+    
+    RECENT_RUNS = 20
+    
+    def __init__(self, db_path=None):
+        self.db_path = db_path or os.path.join(CONFIG_DIR, "history.sqlite3")
+        self.host = platform.node() or "localhost"
+        
+    def _connect(self):
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        conn = sqlite3.connect(self.db_path, timeout=5)
+        conn.execute("""CREATE TABLE IF NOT EXISTS runs (
+                            id INTEGER PRIMARY KEY,
+                            host TEXT NOT NULL,
+                            workers INTEGER NOT NULL,
+                            pages INTEGER NOT NULL,
+                            seconds REAL NOT NULL,
+                            finished_at REAL NOT NULL)""")
+        return conn
+        
+    def record(self, pages, seconds, workers):
+        """Store the outcome of a finished batch"""
+        if pages <= 0 or seconds <= 0:
+            return
+        try:
+            with closing(self._connect()) as conn, conn:
+                conn.execute("INSERT INTO runs (host, workers, pages, seconds, finished_at) "
+                             "VALUES (?, ?, ?, ?, ?)",
+                             (self.host, workers, pages, seconds, time.time()))
+        except sqlite3.Error as e:
+            print(f"Error saving throughput history: {e}")
+            
+    def pages_per_second(self, workers=1):
+        """Expected rate with this many workers based on recent runs, or None without history"""
+        try:
+            with closing(self._connect()) as conn:
+                row = conn.execute("SELECT SUM(pages), SUM(seconds * workers) FROM "
+                                   "(SELECT pages, seconds, workers FROM runs WHERE host = ? "
+                                   " ORDER BY finished_at DESC LIMIT ?)",
+                                   (self.host, self.RECENT_RUNS)).fetchone()
+        except sqlite3.Error as e:
+            print(f"Error reading throughput history: {e}")
+            return None
+            
+        pages, worker_seconds = row
+        if not pages or not worker_seconds:
+            return None
+        return pages / worker_seconds * workers
+
+class ThroughputMeter:
+    """Tracks the pages/second of a running batch and estimates the time remaining.
+    
+    Until enough pages have been measured the estimate leans on the
+    historical rate for this machine, then shifts to the live rate.
+    """
+    
+    WARMUP_PAGES = 20
+    
+    def __init__(self, total_pages, expected_rate=None):
+        self.total_pages = total_pages
+        self.expected_rate = expected_rate
+        self.pages_done = 0
+        self.started = time.monotonic()
+        
+    @property
+    def elapsed(self):
+        return time.monotonic() - self.started
+        
+    def update(self, pages_done):
+        self.pages_done = pages_done
+        
+    @property
+    def live_rate(self):
+        elapsed = self.elapsed
+        return self.pages_done / elapsed if self.pages_done and elapsed > 0 else None
+        
+    @property
+    def rate(self):
+        live = self.live_rate
+        if live is None or not self.expected_rate:
+            return live or self.expected_rate
+        weight = min(1.0, self.pages_done / self.WARMUP_PAGES)
+        return weight * live + (1 - weight) * self.expected_rate
+        
+    @property
+    def eta(self):
+        """Seconds remaining, or None while the rate is unknown"""
+        rate = self.rate
+        return (self.total_pages - self.pages_done) / rate if rate else None
+        
+    def summary(self):
+        text = f"{self.pages_done}/{self.total_pages} pages"
+        if self.live_rate:
+            text += f" · {self.live_rate:.1f} pages/s"
+        if self.eta is not None:
+            text += f" · ETA {format_duration(self.eta)}"
+        return text
+
+class BatchJob:
+    """One input file to convert, with the number of pages it will render"""
+    
+    def __init__(self, input_path, output_path, options, pages=0, part_suffix=".part"):
+        self.input_path = input_path
+        self.output_path = output_path
+        self.options = options
+        self.pages = pages
+        self.part_suffix = part_suffix    # Outputs are written here first, then renamed
+        
+    @property
+    def name(self):
+        return input_name(self.input_path)
+        
+    @property
+    def output_paths(self):
+        targets = self.options.get("targets")
+        if targets:
+            return [OutputTarget.coerce(t).output_path for t in targets]
+        return [self.output_path]
+
+def schedule_jobs(jobs):
+    """Order jobs largest-first so a big deck never runs alone at the end of a batch"""
+    return sorted(jobs, key=lambda job: job.pages, reverse=True)
+
+def _run_batch_job(job, progress_callback=None, on_outputs=None, cancel_token=None):
+    """Convert one job, writing each output to a .part file that is renamed when complete.
+    
+    on_outputs(part_paths) is called before writing starts, so a supervisor
+    can delete the partial files if the conversion is killed. Returns the
+    processor, for its optimize and verify results.
+    """
+    processor = PDFProcessor(job.input_path, job.output_path, cancel_token=cancel_token,
+                             **job.options)
+    final_paths = [target.output_path for target in processor.targets]
+    for target in processor.targets:
+        # Same-named inputs from different folders get their outputs in subfolders
+        os.makedirs(os.path.dirname(os.path.abspath(target.output_path)), exist_ok=True)
+        target.output_path += job.part_suffix
+    if on_outputs:
+        on_outputs([target.output_path for target in processor.targets])
+        
+    try:
+        processor.process(progress_callback=progress_callback)
+    except BaseException:
+        _remove_files(target.output_path for target in processor.targets)
+        raise
+    for target, path in zip(processor.targets, final_paths):
+        os.replace(target.output_path, path)
+        for result in processor.optimized:
+            if result.path == target.output_path:
+                result.path = path
+    return processor
+
+def _remove_files(paths):
+    for path in paths:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+def _limit_memory(limit_mb):
+    """Cap this process's memory (and its children's); returns False if that isn't possible here"""
+    limit = int(limit_mb * 1024 * 1024)
+    if sys.platform == "win32":
+        return _limit_memory_windows(limit)
+    try:
+        import resource
+    except ImportError:
+        return False
+    soft, hard = resource.getrlimit(resource.RLIMIT_AS)
+    if hard != resource.RLIM_INFINITY:
+        limit = min(limit, hard)
+    resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+    return True
+
+def _limit_memory_windows(limit):
+    """Put this process in a job object that caps each of its processes at limit bytes.
+    
+    Allocations past the limit fail, which Python raises as MemoryError.
+    Render processes started later join the same job.
+    """
+    import ctypes
+    from ctypes import wintypes
+    
+    class BasicLimits(ctypes.Structure):
+        _fields_ = [("PerProcessUserTimeLimit", ctypes.c_int64),
+                    ("PerJobUserTimeLimit", ctypes.c_int64),
+                    ("LimitFlags", wintypes.DWORD),
+                    ("MinimumWorkingSetSize", ctypes.c_size_t),
+                    ("MaximumWorkingSetSize", ctypes.c_size_t),
+                    ("ActiveProcessLimit", wintypes.DWORD),
+                    ("Affinity", ctypes.c_size_t),
+                    ("PriorityClass", wintypes.DWORD),
+                    ("SchedulingClass", wintypes.DWORD)]
+                    
+    class ExtendedLimits(ctypes.Structure):
+        _fields_ = [("BasicLimitInformation", BasicLimits),
+                    ("IoInfo", ctypes.c_uint64 * 6),
+                    ("ProcessMemoryLimit", ctypes.c_size_t),
+                    ("JobMemoryLimit", ctypes.c_size_t),
+                    ("PeakProcessMemoryUsed", ctypes.c_size_t),
+                    ("PeakJobMemoryUsed", ctypes.c_size_t)]
+                    
+    JOB_OBJECT_LIMIT_PROCESS_MEMORY = 0x100
+    JobObjectExtendedLimitInformation = 9
+    
+    kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+    kernel32.CreateJobObjectW.restype = wintypes.HANDLE
+    kernel32.GetCurrentProcess.restype = wintypes.HANDLE
+    kernel32.SetInformationJobObject.argtypes = (wintypes.HANDLE, ctypes.c_int, ctypes.c_void_p,
+                                                 wintypes.DWORD)
+    kernel32.AssignProcessToJobObject.argtypes = (wintypes.HANDLE, wintypes.HANDLE)
+    
+    # The job lives as long as this process; its handle is deliberately never closed
+    job = kernel32.CreateJobObjectW(None, None)
+    if not job:
+        return False
+    info = ExtendedLimits()
+    info.BasicLimitInformation.LimitFlags = JOB_OBJECT_LIMIT_PROCESS_MEMORY
+    info.ProcessMemoryLimit = limit
+    if not kernel32.SetInformationJobObject(job, JobObjectExtendedLimitInformation,
+                                            ctypes.byref(info), ctypes.sizeof(info)):
+        return False
+    return bool(kernel32.AssignProcessToJobObject(job, kernel32.GetCurrentProcess()))
+
+def _supervised_worker(inbox, results, memory_limit, cancel_token):
+    """Convert jobs received on inbox one at a time, reporting on results (runs in a child process)"""
+    if memory_limit and psutil is None and not _limit_memory(memory_limit):
+        results.send(("unlimited", None, None))
+        
+    while True:
+        try:
+            item = inbox.recv()
+        except EOFError:
+            return  # Supervisor went away
+        if item is None:
+            return
+        job_id, job = item
+        results.send(("started", job_id, None))
+        
+        def report(current, total):
+            results.send(("page", job_id, (current, total)))
+            
+        def outputs(paths):
+            results.send(("outputs", job_id, paths))
+            
+        try:
+            processor = _run_batch_job(job, report, outputs, cancel_token)
+            if processor.optimized:
+                results.send(("optimized", job_id, processor.optimized))
+            if processor.checker is not None:
+                flagged = processor.checker.flagged(processor.fidelity)
+                results.send(("fidelity", job_id, (len(processor.fidelity), flagged)))
+            if processor.budget is not None and processor.budget.missed:
+                results.send(("budget", job_id, processor.budget.missed))
+            results.send(("done", job_id, None))
+        except MemoryError:
+            results.send(("done", job_id, f"Exceeded the memory limit ({memory_limit} MB)"))
+            return  # Leave the fragmented heap behind; the supervisor starts a fresh worker
+        except Exception as e:
+            results.send(("done", job_id, str(e) or type(e).__name__))
+
+class _SupervisedWorker:
+    """Parent-side handle of one supervised worker process and the job it is running"""
+    
+    def __init__(self, ctx, memory_limit, cancel_token):
+        inbox_recv, self.inbox = ctx.Pipe(duplex=False)
+        self.results, results_send = ctx.Pipe(duplex=False)
+        # Not a daemon: the worker starts its own render processes
+        self.proc = ctx.Process(target=_supervised_worker,
+                                args=(inbox_recv, results_send, memory_limit, cancel_token))
+        self.proc.start()
+        # Close our copies of the child's ends, so its death shows up as EOF
+        inbox_recv.close()
+        results_send.close()
+        self.job_id = None
+        self.started = None
+        self.limit = None
+        self.outputs = []
+        
+    def memory_mb(self):
+        """Resident memory of the worker and its render processes, or 0 without psutil"""
+        if psutil is None:
+            return 0
+        try:
+            proc = psutil.Process(self.proc.pid)
+            procs = [proc] + proc.children(recursive=True)
+            total = 0
+            for p in procs:
+                try:
+                    total += p.memory_info().rss
+                except psutil.Error:
+                    pass
+            return total / (1024 * 1024)
+        except psutil.Error:
+            return 0
+            
+    def kill(self):
+        if psutil is not None:
+            try:
+                for child in psutil.Process(self.proc.pid).children(recursive=True):
+                    child.kill()
+            except psutil.Error:
+                pass
+        # Without psutil, render processes notice the dead writer and exit by themselves
+        self.proc.kill()
+        self.proc.join()
+        self.close()
+        
+    def close(self):
+        self.inbox.close()
+        self.results.close()
+
+class SupervisedPool:
+    """Worker processes that each convert one BatchJob at a time, under supervision.
+    
+    A job that runs past its wall-clock limit, or whose worker grows past the
+    memory limit or crashes, is failed: the worker is killed, its partial
+    output removed and a fresh worker started, while the other workers carry
+    on. Memory is measured with psutil when it is installed; otherwise it is
+    capped inside each worker, with RLIMIT_AS on POSIX or a job object on
+    Windows. If neither works, a warning is printed once and files run unlimited.
+    
+    The workers share cancel_token: while it is paused no new jobs start and
+    time limits stop counting; once cancelled, queued jobs are dropped and
+    running ones get CANCEL_GRACE seconds to stop before they are killed.
+    """
+    
+    POLL_SECONDS = 0.1
+    CANCEL_GRACE = 2.0
+    MIN_TIMEOUT = 120         # Seconds per file when no explicit timeout is given...
+    SECONDS_PER_PAGE = 5      # ...growing with the number of pages to render
+    
+    def __init__(self, workers, timeout=None, memory_limit=None, cancel_token=None):
+        self.ctx = multiprocessing.get_context("spawn")
+        self.timeout = timeout
+        self.memory_limit = memory_limit
+        self.cancel_token = cancel_token or CancelToken(self.ctx)
+        self._paused_at = None
+        self._cancel_deadline = None
+        self.queue = deque()
+        self.workers = [self._spawn() for _ in range(workers)]
+        self.restarts = 0
+        self.memory_enforced = True
+        atexit.register(self.shutdown)  # Don't leave workers behind if the app quits mid-batch
+        
+    def _spawn(self):
+        return _SupervisedWorker(self.ctx, self.memory_limit, self.cancel_token)
+        
+    def _job_limit(self, pages):
+        if self.timeout:
+            return self.timeout
+        return max(self.MIN_TIMEOUT, pages * self.SECONDS_PER_PAGE)
+        
+    def submit(self, job_id, job):
+        self.queue.append((job_id, job))
+        
+    @property
+    def pending(self):
+        """Number of jobs queued or running"""
+        return len(self.queue) + sum(1 for w in self.workers if w.job_id is not None)
+        
+    def poll(self):
+        """Start queued jobs on idle workers and wait briefly for news.
+        
+        Returns a list of events: ("page", job_id, (current, total)),
+        ("optimized", job_id, [OptimizeResult]), ("fidelity", job_id,
+        (slides_checked, [flagged SlideScore])), ("budget", job_id, pages over
+        the size limit) and ("done", job_id, error), where error is None on success.
+        """
+        now = time.monotonic()
+        if self.cancel_token.cancelled and self._cancel_deadline is None:
+            self.queue.clear()
+            self._cancel_deadline = now + self.CANCEL_GRACE
+        if self.cancel_token.paused:
+            if self._paused_at is None:
+                self._paused_at = now
+        elif self._paused_at is not None:
+            # Don't count the pause against anyone's time limit
+            for worker in self.workers:
+                if worker.started is not None:
+                    worker.started += now - self._paused_at
+            self._paused_at = None
+            
+        for worker in self.workers:
+            if self._paused_at is not None:
+                break
+            if worker.job_id is None and self.queue:
+                job_id, job = self.queue.popleft()
+                worker.job_id, worker.outputs = job_id, []
+                worker.started = None     # Set when the worker picks the job up
+                worker.limit = self._job_limit(job.pages)
+                worker.inbox.send((job_id, job))
+                
+        events = []
+        connection.wait([w.results for w in self.workers], timeout=self.POLL_SECONDS)
+        for i, worker in enumerate(self.workers):
+            if worker is None:
+                continue
+            if not self._drain(worker, events):
+                if worker.job_id is not None:
+                    worker.proc.join(timeout=1)
+                    self._fail(i, events, f"Worker crashed (exit code {worker.proc.exitcode})")
+                else:
+                    self._replace(i)
+                continue
+            if worker.job_id is None:
+                continue
+            if self._cancel_deadline is not None and time.monotonic() > self._cancel_deadline:
+                self._fail(i, events, "Cancelled", respawn=False)
+                continue
+            if worker.started is None or self._paused_at is not None:
+                continue
+                
+            elapsed = time.monotonic() - worker.started
+            if elapsed > worker.limit:
+                self._fail(i, events, f"Timed out after {format_duration(elapsed)}")
+            elif self.memory_limit and worker.memory_mb() > self.memory_limit:
+                self._fail(i, events, f"Exceeded the memory limit ({self.memory_limit} MB)")
+        self.workers = [w for w in self.workers if w is not None]
+        return events
+        
+    def _drain(self, worker, events):
+        """Collect the worker's messages; returns False once its process is gone"""
+        try:
+            while worker.results.poll():
+                kind, job_id, value = worker.results.recv()
+                if kind == "started":
+                    worker.started = time.monotonic()
+                elif kind == "unlimited":
+                    if self.memory_enforced:
+                        print(f"Warning: the {self.memory_limit} MB memory limit can't be enforced "
+                              f"here; install psutil to enforce it")
+                    self.memory_enforced = False
+                elif kind == "outputs":
+                    worker.outputs = value
+                elif kind == "page":
+                    # Learn the real page count, so large decks get a proportional limit
+                    worker.limit = max(worker.limit, self._job_limit(value[1]))
+                    events.append((kind, job_id, value))
+                else:
+                    if kind == "done":
+                        worker.job_id = None
+                    events.append((kind, job_id, value))
+        except (EOFError, OSError):
+            return False
+        return True
+        
+    def _fail(self, i, events, error, respawn=True):
+        worker = self.workers[i]
+        events.append(("done", worker.job_id, error))
+        worker.job_id = None
+        worker.kill()
+        _remove_files(worker.outputs)
+        if respawn:
+            self.workers[i] = self._spawn()
+            self.restarts += 1
+        else:
+            self.workers[i] = None  # Dropped at the end of poll()
+        
+    def _replace(self, i):
+        self.workers[i].kill()
+        self.workers[i] = self._spawn() if self._cancel_deadline is None else None
+        
+    def shutdown(self):
+        """Stop all workers, killing any that are still busy"""
+        atexit.unregister(self.shutdown)
+        for worker in self.workers:
+            if worker.job_id is None:
+                try:
+                    worker.inbox.send(None)
+                except OSError:
+                    pass
+        for worker in self.workers:
+            worker.proc.join(timeout=2 if worker.job_id is None else 0)
+            if worker.proc.is_alive():
+                worker.kill()
+                _remove_files(worker.outputs)
+            else:
+                worker.close()
+        self.workers = []
+
+class BatchRunner:
+    """Converts a batch of jobs on a pool of worker processes, largest job first.
+    
+    Page progress from the workers is folded into a ThroughputMeter, and the
+    measured throughput is stored in the history when the batch finishes.
+    Each file runs under a SupervisedPool's time and memory limits, so a file
+    that hangs or crashes MuPDF is reported as a failure without stopping the batch.
+    cancel(), pause() and resume() may be called from any thread while run() works.
+    """
+    
+    DEFAULT_MEMORY_LIMIT = 2048   # MB per worker
+    
+    def __init__(self, jobs, workers=None, history=None, timeout=None,
+                 memory_limit=DEFAULT_MEMORY_LIMIT):
+        self.jobs = schedule_jobs(jobs)
+        available = workers or default_worker_count()
+        self.workers = max(1, min(available, len(self.jobs) or 1))
+        
+        # With fewer files than cores, split each file's pages over the spare cores
+        render_workers = available // max(1, len(self.jobs))
+        if render_workers > 1:
+            for job in self.jobs:
+                job.options = dict(job.options, render_workers=render_workers)
+        self.history = history or ThroughputHistory()
+        self.total_pages = sum(job.pages for job in self.jobs)
+        self.meter = ThroughputMeter(self.total_pages, self.history.pages_per_second(self.workers))
+        self.timeout = timeout
+        self.memory_limit = memory_limit
+        self.failures = []
+        self.optimized = []   # OptimizeResults of jobs run with the optimize option
+        self.slides_checked = 0
+        self.flagged_slides = []  # (file name, SlideScore) below the threshold, with verify
+        self.over_budget = []     # (file name, pages over the size limit)
+        self.cancel_token = CancelToken()
+        
+    def cancel(self):
+        """Stop the batch: queued files are dropped, running ones stop within a page"""
+        self.cancel_token.cancel()
+        
+    def pause(self):
+        self.cancel_token.pause()
+        
+    def resume(self):
+        self.cancel_token.resume()
+        
+    @property
+    def cancelled(self):
+        return self.cancel_token.cancelled
+        
+    def run(self, on_progress=None, on_file_done=None):
+        """Run all jobs; returns the list of (name, error) failures.
+        
+        on_progress(meter) and on_file_done(files_done, job, error) are called
+        on the calling thread; error is a message, or None on success. Files
+        stopped by cancel() are not counted as failures.
+        """
+        pages_done = [0] * len(self.jobs)
+        files_done = failed_pages = 0
+        self.meter = ThroughputMeter(self.total_pages, self.meter.expected_rate)
+        
+        pool = SupervisedPool(self.workers, self.timeout, self.memory_limit, self.cancel_token)
+        try:
+            for job_id, job in enumerate(self.jobs):
+                pool.submit(job_id, job)
+                
+            while pool.pending:
+                for kind, job_id, value in pool.poll():
+                    job = self.jobs[job_id]
+                    if kind == "page":
+                        pages_done[job_id] = min(value[0], job.pages)
+                        continue
+                    if kind == "optimized":
+                        self.optimized.extend(value)
+                        continue
+                    if kind == "fidelity":
+                        self.slides_checked += value[0]
+                        self.flagged_slides.extend((job.name, score) for score in value[1])
+                        continue
+                    if kind == "budget":
+                        self.over_budget.append((job.name, value))
+                        continue
+                        
+                    if value is not None:
+                        if self.cancelled:
+                            continue  # Stopped by cancel(), not a failure
+                        self.failures.append((job.name, value))
+                        failed_pages += job.pages
+                    pages_done[job_id] = job.pages
+                    files_done += 1
+                    if on_file_done:
+                        on_file_done(files_done, job, value)
+                        
+                self.meter.update(sum(pages_done))
+                if on_progress:
+                    on_progress(self.meter)
+        finally:
+            pool.shutdown()
+            
+        # A cancelled run's speed says little about the machine
+        if not self.cancelled:
+            self.history.record(self.total_pages - failed_pages, self.meter.elapsed, self.workers)
+        return self.failures
+
+def default_worker_count():
+    """Leave one core free for the UI"""
+    return max(1, (os.cpu_count() or 2) - 1)
+
+def _peak_memory_mb():
+    """Peak memory of this process in MB, or None where it can't be measured"""
+    if psutil is not None:
+        peak = getattr(psutil.Process().memory_info(), "peak_wset", None)   # Windows only
+        if peak:
+            return peak / 1024 / 1024
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Bytes on macOS, kilobytes elsewhere
+    return peak / 1024 / 1024 if sys.platform == "darwin" else peak / 1024
+
+def _physical_memory_mb():
+    """Installed memory in MB, or None if unknown"""
+    if psutil is not None:
+        return psutil.virtual_memory().total / 1024 / 1024
+    try:
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES") / 1024 / 1024
+    except (AttributeError, ValueError, OSError):
+        return None
+
+def _autotune_warmup():
+    """Runs first in every tuning process, so start-up isn't part of the timing"""
+    return os.getpid()
+
+def _autotune_trial(sample, options):
+    """Convert the autotune sample once (runs in a tuning process).
+    
+    Returns the wall-clock start and end of the conversion, the output size,
+    this process's peak memory in MB, the lowest fidelity score and the
+    lowest pixels per printed inch of any slide per unit of render scale
+    (both None unless options verify).
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        processor = PDFProcessor(sample, os.path.join(tmp, "sample.pdf"), **options)
+        started = time.time()
+        processor.process()
+        # Checking quality is part of tuning, not of the conversion being timed
+        finished = time.time() - (processor.checker.seconds if processor.checker else 0)
+        output_bytes = sum(os.path.getsize(target.output_path) for target in processor.targets)
+    score = min((s.score for s in processor.fidelity), default=None)
+    
+    # The fidelity check works at thumbnail size, so it can't see the render
+    # resolution; work it out from the layout instead
+    dpi_per_scale = None
+    with open_pdf(sample) as doc:
+        for placements in processor.placements.values():
+            for layout, sheet, src_idx, (x, y, w, h) in placements:
+                dpi = 72 * doc[src_idx].rect.width / w
+                dpi_per_scale = dpi if dpi_per_scale is None else min(dpi_per_scale, dpi)
+    return started, finished, output_bytes, _peak_memory_mb(), score, dpi_per_scale
+
+def describe_profile(profile):
+    """One line about a tuned profile, e.g. '2 workers, render scale 1.5, composite 150 DPI'"""
+    encoding = (f"composite {profile['composite_dpi']} DPI" if profile["composite_dpi"]
+                else "per-slide images")
+    workers = profile["workers"]
+    return f"{workers} worker{'s' if workers != 1 else ''}, render scale {profile['render_scale']:g}, {encoding}"
+
+class TuningResult:
+    """How one candidate setting did on the autotune sample"""
+    
+    def __init__(self, workers, render_scale, composite_dpi, pages=0, seconds=0.0, peak_mb=None,
+                 output_bytes=0, score=None, print_dpi=None):
+        self.workers = workers
+        self.render_scale = render_scale
+        self.composite_dpi = composite_dpi
+        self.pages = pages              # Over all workers
+        self.seconds = seconds
+        self.peak_mb = peak_mb          # Summed over all workers
+        self.output_bytes = output_bytes  # Of one copy of the sample
+        self.score = score              # Lowest fidelity score, if checked
+        self.print_dpi = print_dpi      # Lowest resolution of a printed slide, if checked
+        self.min_print_dpi = None       # The resolution it had to reach
+        self.rejected = None            # Why the setting can't be used, if it can't
+        
+    @property
+    def pages_per_second(self):
+        return self.pages / self.seconds if self.seconds > 0 else 0.0
+        
+    @property
+    def profile(self):
+        return {"workers": self.workers, "render_scale": self.render_scale,
+                "composite_dpi": self.composite_dpi}
+        
+    def __str__(self):
+        text = describe_profile(self.profile)
+        if self.seconds > 0:
+            text += f": {self.pages_per_second:.1f} pages/s, {format_size(self.output_bytes)}"
+        if self.peak_mb is not None:
+            text += f", {self.peak_mb:.0f} MB peak"
+        if self.score is not None:
+            text += f", quality {self.score:.2f}"
+        if self.print_dpi is not None:
+            text += f", {self.print_dpi:.0f} DPI in print"
+        if self.rejected:
+            text += f" ({self.rejected})"
+        return text
+
+class Autotuner:
+    """Picks the fastest worker count, render scale and sheet encoding from a sample run"""
+    
+    # Pages, spread over the batch, that every candidate converts
+    SAMPLE_PAGES = 12
+    # Candidates, each tried in a fresh process; without NumPy nothing can vouch
+    # for a lower resolution, so only the default is tried and just workers are tuned
+    RENDER_SCALES = (1, 1.5, 2)
+    COMPOSITE_DPIS = (None, 200, 300)
+    # Settings this close to the fastest count as equally fast; the smallest output wins
+    SPEED_TOLERANCE = 0.05
+    # Slides must print at this resolution, or at what the default render scale gives if less
+    MIN_PRINT_DPI = 200
+    DEFAULT_RENDER_SCALE = 2    # PDFProcessor's
+    # The winner then runs on 2, 4, ... workers while each step adds this much throughput
+    MIN_WORKER_GAIN = 0.1
+    # Share of the installed memory all workers together may use (memory_ceiling's default)
+    MEMORY_SHARE = 0.75
     
-    def config(self, **kwargs):
-        """Update button configuration"""
-        if "text" in kwargs:
-            self.canvas.itemconfig(self.text_id, text=kwargs["text"])
+    # Options that don't change how pages are converted, or that would write outside the sample
+    IGNORED_OPTIONS = ("targets", "optimize", "verify", "render_workers", "max_sheets")
+    
+    def __init__(self, sources, options=None, memory_limit=BatchRunner.DEFAULT_MEMORY_LIMIT,
+                 memory_ceiling=None, quality_floor=0.8, min_print_dpi=MIN_PRINT_DPI,
+                 render_scales=None, composite_dpis=None, max_workers=None, on_result=None):
+        self.sources = list(sources)
+        self.options = {k: v for k, v in (options or {}).items() if k not in self.IGNORED_OPTIONS}
+        self.skip_first = self.options.pop("skip_first", True)
+        self.memory_limit = memory_limit
+        physical = _physical_memory_mb()
+        self.memory_ceiling = memory_ceiling or (physical * self.MEMORY_SHARE if physical else None)
+        self.quality_floor = quality_floor
+        self.min_print_dpi = min_print_dpi
+        self.verify = np is not None
+        self.render_scales = render_scales or (self.RENDER_SCALES if self.verify
+                                               else (self.DEFAULT_RENDER_SCALE,))
+        self.composite_dpis = composite_dpis or (self.COMPOSITE_DPIS if self.verify else (None,))
+        self.max_workers = max_workers or default_worker_count()
+        self.on_result = on_result
+        self.results = []
         
-        if "bg" in kwargs:
-            self.bg = kwargs["bg"]
-            self.canvas.itemconfig(self.bg_id, fill=self.bg)
-            self.canvas.config(bg=self.bg)
-            
-        if "fg" in kwargs:
-            self.fg = kwargs["fg"]
-            self.canvas.itemconfig(self.text_id, fill=self.fg)
+    def build_sample(self):
+        """Copy pages spread evenly over the sources into one PDF; returns (bytes, pages)"""
+        step = max(1, len(self.sources) // self.SAMPLE_PAGES)
+        picked = self.sources[::step][:self.SAMPLE_PAGES]
+        per_source = ceil(self.SAMPLE_PAGES / max(1, len(picked)))
+        
+        # The GUI builds the sample on a background thread next to the preview and thumbnails
+        with FITZ_LOCK, fitz.open() as sample:
+            for source in picked:
+                with open_pdf(source) as doc:
+                    first = 1 if self.skip_first and doc.page_count > 1 else 0
+                    indices = list(range(first, doc.page_count))
+                    for src_idx in indices[::max(1, len(indices) // per_source)][:per_source]:
+                        sample.insert_pdf(doc, from_page=src_idx, to_page=src_idx)
+            pages = min(sample.page_count, self.SAMPLE_PAGES)
+            if pages < sample.page_count:
+                sample.select(range(pages))
+            return sample.tobytes(), pages
+        
+    def run(self):
+        """Measure the candidates and return the chosen profile (see TuningResult.profile).
+        
+        Raises RuntimeError if no setting meets the quality floor and memory limits.
+        """
+        sample, pages = self.build_sample()
+        if not pages:
+            raise RuntimeError("No pages to sample")
             
-        if "hover_bg" in kwargs:
-            self.hover_bg = kwargs["hover_bg"]
+        candidates = [self._measure(sample, pages, 1, scale, dpi)
+                      for scale in self.render_scales for dpi in self.composite_dpis]
+        usable = [r for r in candidates if not r.rejected]
+        if not usable:
+            raise RuntimeError("No setting met the quality floor and memory limit")
+        fastest = max(r.pages_per_second for r in usable)
+        best = min((r for r in usable if r.pages_per_second >= fastest * (1 - self.SPEED_TOLERANCE)),
+                   key=lambda r: r.output_bytes)
+                   
+        for workers in self._worker_steps():
+            result = self._measure(sample, pages, workers, best.render_scale, best.composite_dpi)
+            if result.rejected or \
+                    result.pages_per_second < best.pages_per_second * (1 + self.MIN_WORKER_GAIN):
+                break
+            best = result
+        return best.profile
+        
+    def _worker_steps(self):
+        """2, 4, 8, ... and finally max_workers"""
+        steps, workers = [], 2
+        while workers < self.max_workers:
+            steps.append(workers)
+            workers *= 2
+        if self.max_workers > 1:
+            steps.append(self.max_workers)
+        return steps
+        
+    def _measure(self, sample, pages, workers, render_scale, composite_dpi):
+        """Convert the sample on workers processes at once and record a TuningResult"""
+        result = TuningResult(workers, render_scale, composite_dpi)
+        options = dict(self.options, skip_first=False, render_scale=render_scale,
+                       composite_dpi=composite_dpi, verify=self.verify)
+        ctx = multiprocessing.get_context("spawn")
+        try:
+            with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as pool:
+                # Start every process before the clock does
+                for future in [pool.submit(_autotune_warmup) for _ in range(workers)]:
+                    future.result()
+                trials = [future.result() for future in
+                          [pool.submit(_autotune_trial, sample, options) for _ in range(workers)]]
+        except Exception as e:
+            result.rejected = f"failed: {e}"
+        else:
+            peaks = [trial[3] for trial in trials]
+            scores = [trial[4] for trial in trials if trial[4] is not None]
+            result.pages = pages * workers
+            result.seconds = max(t[1] for t in trials) - min(t[0] for t in trials)
+            result.peak_mb = sum(peaks) if None not in peaks else None
+            result.output_bytes = trials[0][2]
+            result.score = min(scores, default=None)
+            if trials[0][5] is not None:
+                result.print_dpi = min(render_scale * trials[0][5], composite_dpi or float("inf"))
+                result.min_print_dpi = min(self.min_print_dpi,
+                                           self.DEFAULT_RENDER_SCALE * trials[0][5])
+            result.rejected = self._rejection(result)
             
-        if "state" in kwargs:
-            if kwargs["state"] == "disabled":
-                self.canvas.unbind("<Button-1>")
-                self.canvas.unbind("<ButtonRelease-1>")
-                self.canvas.itemconfig(self.bg_id, fill="#bbbbbb")
-                self.canvas.itemconfig(self.text_id, fill="#888888")
-            else:
-                self.canvas.bind("<Button-1>", self._on_press)
-                self.canvas.bind("<ButtonRelease-1>", self._on_release)
-                self.canvas.itemconfig(self.bg_id, fill=self.bg)
-                self.canvas.itemconfig(self.text_id, fill=self.fg)
+        self.results.append(result)
+        if self.on_result:
+            self.on_result(result)
+        return result
+        
+    def _rejection(self, result):
+        if result.score is not None and result.score < self.quality_floor:
+            return "below quality floor"
+        # Half a DPI of slack for rounding in the layout
+        if result.print_dpi is not None and result.print_dpi < result.min_print_dpi - 0.5:
+            return f"under {result.min_print_dpi:.0f} DPI in print"
+        if result.peak_mb is not None:
+            if self.memory_limit and result.peak_mb / result.workers > self.memory_limit:
+                return "over memory limit"
+            if self.memory_ceiling and result.peak_mb > self.memory_ceiling:
+                return "over memory ceiling"
+        return None
 
-class PDFProcessor:
-    def __init__(self, input_path, output_path, skip_first=True, add_title=True, 
-                 title_on_first_only=False, pages_per_sheet=3):
-        self.input_path = input_path
-        self.output_path = output_path
-        self.skip_first = skip_first
-        self.add_title = add_title
-        self.title_on_first_only = title_on_first_only
-        self.pages_per_sheet = pages_per_sheet
+class LeaseLost(Exception):
+    """Raised when a spool lease expired and was reclaimed by another worker"""
 
-    def process(self, progress_callback=None):
-        # Open PDF and get Title metadata or fallback to filename
-        doc = fitz.open(self.input_path)
-        raw_title = doc.metadata.get("title", "").strip()
-        title = raw_title or os.path.splitext(os.path.basename(self.input_path))[0]
+class SpoolLease:
+    """A claimed spool job; path changes every time the lease is renewed"""
+    
+    def __init__(self, job_id, path, job):
+        self.job_id = job_id
+        self.path = path
+        self.job = job
 
-        # Calculate starting page and total pages to process
-        start_page = 1 if self.skip_first else 0
-        total_pages = doc.page_count - start_page
+class JobSpool:
+    """Directory-based job queue shared by any number of workers on any host.
+    
+    A job is a JSON file moved between incoming/, leased/, done/ and failed/
+    with os.rename, which is atomic within one filesystem, so exactly one
+    worker wins every claim. A leased file is named <job>@<expiry>@<worker>.json;
+    renewing renames it to a later expiry, and an expired lease is renamed
+    back to incoming/ by whichever worker sees it first. A worker whose rename
+    fails has lost its lease. Hosts need roughly synchronised clocks, and job
+    paths must resolve on every host that mounts the spool.
+    """
+    
+    DIRS = ("tmp", "incoming", "leased", "done", "failed")
+    
+    def __init__(self, root, lease_seconds=120):
+        self.root = root
+        self.lease_seconds = lease_seconds
+        self.worker_id = f"{platform.node() or 'localhost'}-{os.getpid()}"
+        for name in self.DIRS:
+            os.makedirs(os.path.join(root, name), exist_ok=True)
+            
+    def _dir(self, name):
+        return os.path.join(self.root, name)
         
-        if total_pages <= 0:
-            doc.close()
-            raise ValueError(f"'{os.path.basename(self.input_path)}' has no pages to process.")
-
-        # Calculate how many output pages we'll need
-        output_page_count = ceil(total_pages / self.pages_per_sheet)
+    def submit(self, input_path, output_path, options):
+        """Queue a conversion and return its job id"""
+        job_id = f"{time.time_ns():020d}-{uuid.uuid4().hex[:8]}"
+        job = {"input": input_path, "output": output_path, "options": options}
+        tmp_path = os.path.join(self._dir("tmp"), f"{job_id}.json")
+        with open(tmp_path, "w") as f:
+            json.dump(job, f)
+        os.rename(tmp_path, os.path.join(self._dir("incoming"), f"{job_id}.json"))
+        return job_id
         
-        # Create a new PDF with reportlab
-        c = canvas.Canvas(self.output_path, pagesize=A4)
-        width_pt, height_pt = A4
+    def _lease_name(self, job_id):
+        expiry = int(time.time() + self.lease_seconds)
+        return f"{job_id}@{expiry}@{self.worker_id}.json"
         
-        # Process all pages in groups
-        for output_page in range(output_page_count):
-            # Reset page for each new output page
-            if output_page > 0:
-                c.showPage()
-                
-            # Calculate which source pages go on this output page
-            page_start_idx = start_page + (output_page * self.pages_per_sheet)
-            page_end_idx = min(page_start_idx + self.pages_per_sheet, doc.page_count)
-            current_page_count = page_end_idx - page_start_idx
-            
-            # Set up page layout
-            margin = 20 * mm
-            y_cursor = height_pt - margin
-            
-            # Add title if requested
-            should_add_title = self.add_title and (output_page == 0 or not self.title_on_first_only)
-            if should_add_title:
-                c.setFont("Helvetica", 9)
-                # Truncate title if too long
-                max_title_width = width_pt - 2 * margin
-                title_text = f"{title} - Sheet {output_page + 1}/{output_page_count}"
-                
-                # Measure text width and truncate if needed
-                text_width = c.stringWidth(title_text, "Helvetica", 9)
-                if text_width > max_title_width:
-                    # Calculate how many characters we can fit
-                    char_width = text_width / len(title_text)
-                    max_chars = int(max_title_width / char_width) - 3  # -3 for ellipsis
-                    truncated_title = title[:max_chars] + "..."
-                    title_text = f"{truncated_title} - Sheet {output_page + 1}/{output_page_count}"
+    def claim(self):
+        """Take the oldest queued job, or return None when the queue is empty"""
+        for name in sorted(os.listdir(self._dir("incoming"))):
+            if not name.endswith(".json"):
+                continue
+            job_id = name[:-len(".json")]
+            lease_path = os.path.join(self._dir("leased"), self._lease_name(job_id))
+            try:
+                os.rename(os.path.join(self._dir("incoming"), name), lease_path)
+            except (FileNotFoundError, PermissionError):
+                continue  # Another worker got there first
+            with open(lease_path, "r") as f:
+                return SpoolLease(job_id, lease_path, json.load(f))
+        return None
+        
+    def renew(self, lease):
+        """Push the lease expiry forward; raises LeaseLost if it was reclaimed"""
+        new_path = os.path.join(self._dir("leased"), self._lease_name(lease.job_id))
+        try:
+            os.rename(lease.path, new_path)
+        except FileNotFoundError:
+            raise LeaseLost(lease.job_id)
+        lease.path = new_path
+        
+    def complete(self, lease, error=None):
+        """Move a leased job to done/ (or failed/ with the error next to it)"""
+        target = "failed" if error else "done"
+        try:
+            os.rename(lease.path, os.path.join(self._dir(target), f"{lease.job_id}.json"))
+        except FileNotFoundError:
+            raise LeaseLost(lease.job_id)
+        if error:
+            with open(os.path.join(self._dir("failed"), f"{lease.job_id}.error.txt"), "w") as f:
+                f.write(error)
                 
-                c.drawString(20 * mm, height_pt - margin + 5 * mm, title_text)
-            else:
-                y_cursor = height_pt - 10 * mm  # Less margin if no title
+    def reclaim_expired(self):
+        """Return jobs with expired leases to the queue; returns how many were reclaimed"""
+        now = time.time()
+        reclaimed = 0
+        for name in os.listdir(self._dir("leased")):
+            try:
+                job_id, expiry, _ = name[:-len(".json")].split("@", 2)
+                expired = int(expiry) < now
+            except ValueError:
+                continue
+            if not expired:
+                continue
+            try:
+                os.rename(os.path.join(self._dir("leased"), name),
+                          os.path.join(self._dir("incoming"), f"{job_id}.json"))
+                reclaimed += 1
+            except (FileNotFoundError, PermissionError):
+                pass  # Renewed, completed or reclaimed meanwhile
+        return reclaimed
+        
+    def counts(self):
+        return {name: len(os.listdir(self._dir(name))) for name in self.DIRS[1:]}
+
+def run_spool_worker(root, lease_seconds=120, poll_interval=2.0, drain=False, timeout=None,
+                     memory_limit=BatchRunner.DEFAULT_MEMORY_LIMIT):
+    """Pull and convert spool jobs until stopped (or, with drain, until the queue is empty)"""
+    spool = JobSpool(root, lease_seconds)
+    pool = SupervisedPool(1, timeout, memory_limit)
+    try:
+        _spool_loop(spool, pool, lease_seconds, poll_interval, drain)
+    finally:
+        pool.shutdown()
+
+def _spool_loop(spool, pool, lease_seconds, poll_interval, drain):
+    while True:
+        spool.reclaim_expired()
+        lease = spool.claim()
+        if lease is None:
+            if drain and not spool.counts()["leased"]:
+                return
+            time.sleep(poll_interval)
+            continue
             
-            # Calculate section height based on number of images on this page
-            section_h = (y_cursor - 10 * mm) / current_page_count
+        # Keep the lease alive while converting
+        lost = threading.Event()
+        stop = threading.Event()
+        
+        def heartbeat():
+            while not stop.wait(lease_seconds / 3):
+                try:
+                    spool.renew(lease)
+                except LeaseLost:
+                    lost.set()
+                    return
+                    
+        beat = threading.Thread(target=heartbeat, daemon=True)
+        beat.start()
+        
+        job = lease.job
+        error = None
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(job["output"])), exist_ok=True)
+            # Parts are named per worker, so a reclaimed job never leaves a torn file
+            pool.submit(0, BatchJob(job["input"], job["output"], job["options"],
+                                    part_suffix=f".{spool.worker_id}.part"))
+            while pool.pending:
+                for kind, _, value in pool.poll():
+                    if kind == "done":
+                        error = value
+        except Exception as e:
+            error = str(e)
+        finally:
+            stop.set()
+            beat.join()
             
-            # Process each page for this output sheet
-            for i in range(current_page_count):
-                src_idx = page_start_idx + i
-                
-                # Render and invert the page
-                page = doc.load_page(src_idx)
-                pix = page.get_pixmap(matrix=fitz.Matrix(2, 2), alpha=False)
-                img = Image.frombytes("RGB", (pix.width, pix.height), pix.samples)
-                img = ImageOps.invert(img)
-                
-                # Scale to fit width and section height
-                scale = min((width_pt - 2*margin) / img.width, section_h / img.height)
-                w, h = img.width * scale, img.height * scale
-                x = (width_pt - w) / 2
-                y = y_cursor - h
+        try:
+            if lost.is_set():
+                raise LeaseLost(lease.job_id)
+            spool.complete(lease, error)
+            print(f"[{spool.worker_id}] {os.path.basename(job['input'])}: {error or 'done'}")
+        except LeaseLost:
+            print(f"[{spool.worker_id}] lease on {lease.job_id} expired; another worker owns it now")
+
+class ThumbnailLoader:
+    """Loads first-page thumbnails and page counts on a background thread.
+    
+    Only the most recent request is worked on, so rows that scrolled out of
+    view are never loaded. Results live in an LRU cache; a "thumbnails" event
+    is published on the channel whenever new entries are ready.
+    """
+    
+    def __init__(self, channel, size=(48, 64), capacity=512):
+        self.channel = channel
+        self.size = size
+        self.cache = LRUCache(capacity=capacity)
+        self._wanted = []
+        self._cond = threading.Condition()
+        threading.Thread(target=self._worker, daemon=True).start()
+        
+    def get(self, path):
+        """Return (png_data, page_count) if loaded, otherwise None"""
+        return self.cache.get(path)
+        
+    def request(self, paths):
+        """Replace the set of paths waiting to be loaded"""
+        with self._cond:
+            self._wanted = [p for p in paths if self.cache.get(p) is None]
+            self._cond.notify()
+            
+    def _worker(self):
+        while True:
+            with self._cond:
+                while not self._wanted:
+                    self._cond.wait()
+                path = self._wanted.pop(0)
                 
-                # Draw the image
-                buf = io.BytesIO()
-                img.save(buf, format="PNG")
-                buf.seek(0)
-                ir = ImageReader(buf)
-                c.drawImage(ir, x, y, width=w, height=h)
+            try:
+                entry = self.load(path)
+            except Exception:
+                entry = (None, None)
+            self.cache.put(path, entry)
+            self.channel.publish("thumbnails")
+            
+    def load(self, path):
+        """Render a first-page thumbnail as PNG data and read the page count"""
+        with FITZ_LOCK, open_pdf(path) as doc:
+            if doc.page_count == 0:
+                return None, 0
+            page = doc.load_page(0)
+            zoom = min(self.size[0] / page.rect.width, self.size[1] / page.rect.height)
+            pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), alpha=False)
+            return pix.tobytes("png"), doc.page_count
+
+class FileListView(ttk.Frame):
+    """Scrollable file list that only draws (and loads thumbnails for) visible rows"""
+    
+    ROW_HEIGHT = 72
+    
+    def __init__(self, master, theme, loader, on_select=None, **kwargs):
+        super().__init__(master, **kwargs)
+        self.theme = theme
+        self.loader = loader
+        self.on_select = on_select
+        self.paths = []
+        self.details = {}
+        self.selected = None
+        self._rows = {}    # Visible row index -> canvas item ids
+        self._images = {}  # Visible row index -> PhotoImage (kept alive while shown)
+        
+        self.scrollbar = ttk.Scrollbar(self)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        
+        self.canvas = tk.Canvas(self, height=8 * 24, bd=0, highlightthickness=0,
+                                bg=self.theme["frame_bg"])
+        self.canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.canvas.config(yscrollcommand=self._on_scroll)
+        self.scrollbar.config(command=self.canvas.yview)
+        
+        self.canvas.bind("<Configure>", lambda e: self.refresh(redraw=True))
+        self.canvas.bind("<Button-1>", self._on_click)
+        self.canvas.bind("<MouseWheel>", self._on_wheel)
+        self.canvas.bind("<Button-4>", lambda e: self.canvas.yview_scroll(-1, "units"))
+        self.canvas.bind("<Button-5>", lambda e: self.canvas.yview_scroll(1, "units"))
+        
+    def set_items(self, paths):
+        """Replace the listed files"""
+        self.paths = list(paths)
+        self.details = {}
+        self.selected = None
+        self.canvas.config(scrollregion=(0, 0, 1, len(self.paths) * self.ROW_HEIGHT),
+                           yscrollincrement=self.ROW_HEIGHT // 3)
+        self.canvas.yview_moveto(0)
+        self.refresh(redraw=True)
+        
+    def clear(self):
+        self.set_items([])
+        
+    def set_details(self, details):
+        """Set the detail lines shown under file names ({path: text})"""
+        self.details = dict(details)
+        self.refresh(redraw=True)
+        
+    def set_theme(self, theme):
+        self.theme = theme
+        self.canvas.config(bg=self.theme["frame_bg"])
+        self.refresh(redraw=True)
+        
+    def visible_range(self):
+        top = self.canvas.canvasy(0)
+        bottom = top + self.canvas.winfo_height()
+        first = max(0, int(top // self.ROW_HEIGHT))
+        last = min(len(self.paths), int(bottom // self.ROW_HEIGHT) + 1)
+        return first, last
+        
+    def refresh(self, redraw=False):
+        """Draw rows that scrolled into view and drop the ones that left it"""
+        first, last = self.visible_range()
+        visible = set(range(first, last))
+        
+        for idx in list(self._rows):
+            if redraw or idx not in visible:
+                self._delete_row(idx)
                 
-                # Add page number
-                c.setFont("Helvetica", 8)
-                c.drawString(width_pt - margin - 20, y, f"Page {src_idx + 1}")
+        missing = []
+        for idx in range(first, last):
+            if idx not in self._rows:
+                self._draw_row(idx)
+            if self.loader.get(self.paths[idx]) is None:
+                missing.append(self.paths[idx])
                 
-                # Move cursor down for next image
-                y_cursor = y - 5 * mm
+        if missing:
+            self.loader.request(missing)
+            
+    def on_thumbnails_ready(self):
+        """Redraw visible rows whose thumbnail has arrived"""
+        for idx in list(self._rows):
+            if idx not in self._images and self.loader.get(self.paths[idx]) is not None:
+                self._delete_row(idx)
+                self._draw_row(idx)
                 
-                # Update progress
-                if progress_callback:
-                    progress_callback(src_idx - start_page + 1, total_pages)
+    def _delete_row(self, idx):
+        for item in self._rows.pop(idx):
+            self.canvas.delete(item)
+        self._images.pop(idx, None)
         
-        # Finish and save PDF
-        c.save()
-        doc.close()
-        return output_page_count
+    def _draw_row(self, idx):
+        path = self.paths[idx]
+        y = idx * self.ROW_HEIGHT
+        width = max(self.canvas.winfo_width(), 200)
+        items = []
+        
+        if idx == self.selected:
+            items.append(self.canvas.create_rectangle(0, y, width, y + self.ROW_HEIGHT,
+                                                      fill=self.theme["accent"], width=0))
+        
+        entry = self.loader.get(path)
+        png, page_count = entry if entry else (None, None)
+        if png:
+            image = tk.PhotoImage(data=png)
+            self._images[idx] = image
+            items.append(self.canvas.create_image(8 + self.loader.size[0] // 2,
+                                                  y + self.ROW_HEIGHT // 2, image=image))
+        else:
+            w, h = self.loader.size
+            items.append(self.canvas.create_rectangle(8, y + 4, 8 + w, y + 4 + h,
+                                                      outline=self.theme["fg"]))
+        
+        if path in self.details:
+            detail = self.details[path]
+        elif entry is None:
+            detail = "Loading..."
+        elif page_count is None:
+            detail = "Could not open file"
+        else:
+            detail = f"{page_count} pages"
+            
+        x = 16 + self.loader.size[0]
+        items.append(self.canvas.create_text(x, y + 22, anchor=tk.W, fill=self.theme["fg"],
+                                             text=input_name(path), font=("Roboto", 10)))
+        items.append(self.canvas.create_text(x, y + 44, anchor=tk.W, fill=self.theme["fg"],
+                                             text=detail, font=("Roboto", 8)))
+        self._rows[idx] = items
+        
+    def _on_scroll(self, first, last):
+        self.scrollbar.set(first, last)
+        self.refresh()
+        
+    def _on_wheel(self, event):
+        self.canvas.yview_scroll(-3 if event.delta > 0 else 3, "units")
+        
+    def _on_click(self, event):
+        idx = int(self.canvas.canvasy(event.y) // self.ROW_HEIGHT)
+        if 0 <= idx < len(self.paths):
+            self.selected = idx
+            self.refresh(redraw=True)
+            if self.on_select:
+                self.on_select(self.paths[idx])
 
 class App(tk.Tk):
     def __init__(self):
         super().__init__()
         self.title("Slide2Print: Convert Slides into Printable PDFs")
-        self.geometry("600x750")
+        self.geometry("1000x750")
         
         # Initialize variables
         self.file_paths = []
+        self.file_info = {}
+        self.scanning = False
         self.output_dir = ""
         self.failures = []
+        self.batch_runner = None
         self.skip_first_var = BooleanVar(value=True)
         self.add_title_var = BooleanVar(value=True)
         self.title_on_first_only_var = BooleanVar(value=False)  # NEW option
+        self.optimize_var = BooleanVar(value=False)
+        self.profile = load_profile()  # Settings chosen by the last autotune, if any
+        self.composite_var = BooleanVar(value=bool(self.profile.get("composite_dpi")) and np is not None)
+        self.verify_var = BooleanVar(value=False)
+        self.flagged_slides = []
+        self.fidelity_summary = ""
+        self.optimize_summary = ""
         self.dark_mode_var = BooleanVar(value=True)  # Default to dark mode
         self.pages_per_sheet_var = tk.IntVar(value=3)
+        self.max_file_mb_var = tk.StringVar(value="")  # Blank for no size limit
         self.animation_path = ""
         
         # Apply dark mode on startup
@@ -575,6 +3345,9 @@ class App(tk.Tk):
         # Configure padding
         self.configure(padx=20, pady=20)
         
+        # Worker threads report progress through a rate-limited channel
+        self.progress_channel = ProgressChannel(max_rate=10)
+        
         # Create main frame
         main_frame = ttk.Frame(self)
         main_frame.pack(fill=tk.BOTH, expand=True)
@@ -598,6 +3371,16 @@ class App(tk.Tk):
                                       command=self.toggle_theme)
         theme_toggle.pack(side=tk.LEFT)
         
+        # Live preview of the first output sheets
+        preview_frame = ttk.LabelFrame(main_frame, text="Preview")
+        preview_frame.pack(side=tk.RIGHT, fill=tk.Y, padx=(10, 0), pady=(0, 10))
+        
+        self.preview_canvas = tk.Canvas(preview_frame, width=PREVIEW_WIDTH, bd=0, highlightthickness=0,
+                                        bg=self.theme["frame_bg"])
+        self.preview_canvas.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        self.preview_images = []
+        self.preview_sheets = []
+        
         # File selection section
         file_frame = ttk.LabelFrame(main_frame, text="Input Files")
         file_frame.pack(fill=tk.BOTH, expand=True, pady=(0, 10))
@@ -628,20 +3411,22 @@ class App(tk.Tk):
         )
         self.clear_btn.pack(side=tk.LEFT, padx=5)
         
-        # Files list with scrollbar
-        files_frame = ttk.Frame(file_frame)
-        files_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
-        
-        scrollbar = ttk.Scrollbar(files_frame)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.folder_btn = MaterialButton(
+            file_btn_frame, 
+            text="Add Folder", 
+            command=self.select_folder,
+            bg=self.theme["accent"],
+            fg="white",
+            hover_bg="#1565c0",
+            width=150
+        )
+        self.folder_btn.pack(side=tk.LEFT, padx=5)
         
-        self.files_list = tk.Listbox(files_frame, width=80, height=8,
-                                     bg=self.theme["frame_bg"],
-                                     fg=self.theme["fg"],
-                                     selectbackground=self.theme["accent"])
-        self.files_list.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        self.files_list.config(yscrollcommand=scrollbar.set)
-        scrollbar.config(command=self.files_list.yview)
+        # Files list with lazily loaded thumbnails and page counts
+        self.thumbnail_loader = ThumbnailLoader(self.progress_channel)
+        self.files_list = FileListView(file_frame, self.theme, self.thumbnail_loader,
+                                       on_select=lambda path: self.update_preview())
+        self.files_list.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
         
         # Output directory selection
         output_frame = ttk.LabelFrame(main_frame, text="Output Settings")
@@ -676,6 +3461,17 @@ class App(tk.Tk):
                        variable=self.add_title_var).pack(anchor=tk.W, pady=2)
         ttk.Checkbutton(left_opts, text="Title on first page only", 
                        variable=self.title_on_first_only_var).pack(anchor=tk.W, pady=2)
+        ttk.Checkbutton(left_opts, text="Optimize output (smaller, opens faster)", 
+                       variable=self.optimize_var).pack(anchor=tk.W, pady=2)
+        self.composite_check = ttk.Checkbutton(left_opts, text=self._composite_label(),
+                                               variable=self.composite_var)
+        self.composite_check.pack(anchor=tk.W, pady=2)
+        verify_check = ttk.Checkbutton(left_opts, text="Verify legibility of every slide", 
+                                       variable=self.verify_var)
+        verify_check.pack(anchor=tk.W, pady=2)
+        if np is None:
+            self.composite_check.state(['disabled'])
+            verify_check.state(['disabled'])
         
         # Right options column
         right_opts = ttk.Frame(options_frame)
@@ -687,10 +3483,19 @@ class App(tk.Tk):
         
         ttk.Label(sheet_frame, text="Pages per sheet:").pack(side=tk.LEFT)
         pages_combobox = ttk.Combobox(sheet_frame, textvariable=self.pages_per_sheet_var, width=5)
-        pages_combobox['values'] = (1, 2, 3, 4, 6)
+        pages_combobox['values'] = PAGES_PER_SHEET
         pages_combobox.pack(side=tk.LEFT, padx=5)
         pages_combobox.state(['readonly'])
         
+        # Size budget option
+        size_frame = ttk.Frame(right_opts)
+        size_frame.pack(anchor=tk.W, pady=2)
+        
+        ttk.Label(size_frame, text="Max file size (MB):").pack(side=tk.LEFT)
+        size_combobox = ttk.Combobox(size_frame, textvariable=self.max_file_mb_var, width=5)
+        size_combobox['values'] = ("", 1, 2, 5, 10, 20, 50)
+        size_combobox.pack(side=tk.LEFT, padx=5)
+        
         # Splash animation setting
         animation_frame = ttk.Frame(right_opts)
         animation_frame.pack(anchor=tk.W, pady=2, fill=tk.X)
@@ -716,7 +3521,7 @@ class App(tk.Tk):
         detail_frame = ttk.Frame(progress_frame)
         detail_frame.pack(fill=tk.X, padx=5, pady=5)
         
-        ttk.Label(detail_frame, text="Current File:").pack(side=tk.LEFT, padx=(0, 10))
+        ttk.Label(detail_frame, text="Pages:").pack(side=tk.LEFT, padx=(0, 10))
         self.detail_progress = ttk.Progressbar(detail_frame, orient='horizontal', mode='determinate')
         self.detail_progress.pack(side=tk.LEFT, fill='x', expand=True)
         
@@ -726,7 +3531,30 @@ class App(tk.Tk):
         # Loading animation frame
         self.animation_frame = ttk.Frame(progress_frame)
         self.animation_frame.pack(fill=tk.X, padx=5, pady=5)
-        self.loading_animation = None
+        self.loading_animation = ActivityIndicator(self.animation_frame, self.theme)
+        self.success_label = ttk.Label(self.animation_frame, text="✓", font=("Arial", 24),
+                                       foreground=self.theme["status_good"])
+        self._success_after_id = None
+        
+        self.progress_channel.subscribe("status", self._update_status_label)
+        self.progress_channel.subscribe("file", self._update_progress)
+        self.progress_channel.subscribe("page", self._do_update_detail)
+        self.progress_channel.subscribe("done", self._finish)
+        self.progress_channel.subscribe("tuned", self._on_tuned)
+        self.progress_channel.subscribe("preview", self._show_preview)
+        self.progress_channel.subscribe("scan", self._on_scan_progress)
+        self.progress_channel.subscribe("scan_done", self._on_scan_done)
+        self.progress_channel.subscribe("thumbnails", self.files_list.on_thumbnails_ready)
+        self.progress_channel.attach(self)
+        
+        # Re-render the preview whenever an option changes
+        self.pre_scanner = PreScanner(self.progress_channel)
+        self.preview_renderer = PreviewRenderer(self, self.progress_channel, width=PREVIEW_WIDTH)
+        for var in (self.skip_first_var, self.add_title_var,
+                    self.title_on_first_only_var, self.pages_per_sheet_var, self.max_file_mb_var,
+                    self.composite_var):
+            var.trace_add("write", lambda *args: self._on_options_changed())
+        self._show_preview([], None)
         
         # Button frame - ensuring it's always visible
         button_frame = ttk.Frame(main_frame)
@@ -745,6 +3573,33 @@ class App(tk.Tk):
         )
         self.process_btn.pack(side=tk.LEFT, padx=5)
         
+        # Pause and cancel buttons, active while a batch runs
+        self.pause_btn = MaterialButton(
+            button_frame, 
+            text="Pause", 
+            command=self.toggle_pause,
+            bg="#ff9800",
+            fg="white",
+            hover_bg="#f57c00",
+            width=100,
+            height=40
+        )
+        self.pause_btn.pack(side=tk.LEFT, padx=5)
+        
+        self.cancel_btn = MaterialButton(
+            button_frame, 
+            text="Cancel", 
+            command=self.cancel_processing,
+            bg="#9e9e9e",
+            fg="white",
+            hover_bg="#757575",
+            width=100,
+            height=40
+        )
+        self.cancel_btn.pack(side=tk.LEFT, padx=5)
+        self.pause_btn.config(state='disabled')
+        self.cancel_btn.config(state='disabled')
+        
         # Exit button
         exit_btn = MaterialButton(
             button_frame, 
@@ -765,6 +3620,7 @@ class App(tk.Tk):
         # File menu
         file_menu = tk.Menu(menubar, tearoff=0)
         file_menu.add_command(label="Select PDF Files", command=self.select_files)
+        file_menu.add_command(label="Add Folder...", command=self.select_folder)
         file_menu.add_command(label="Select Output Directory", command=self.select_directory)
         file_menu.add_separator()
         file_menu.add_command(label="Exit", command=self.quit)
@@ -775,6 +3631,8 @@ class App(tk.Tk):
         options_menu.add_checkbutton(label="Skip First Page", variable=self.skip_first_var)
         options_menu.add_checkbutton(label="Add Title", variable=self.add_title_var)
         options_menu.add_checkbutton(label="Title on First Page Only", variable=self.title_on_first_only_var)
+        options_menu.add_checkbutton(label="Optimize Output", variable=self.optimize_var)
+        options_menu.add_command(label="Autotune for Selected Files", command=self.autotune)
         options_menu.add_separator()
         options_menu.add_checkbutton(label="Dark Mode", variable=self.dark_mode_var, 
                                     command=self.toggle_theme)
@@ -794,11 +3652,10 @@ class App(tk.Tk):
         self.theme = ThemeManager.apply_theme(self, self.style, is_dark=is_dark)
         
         # Update specific widgets that need manual updating
-        self.files_list.config(
-            bg=self.theme["frame_bg"],
-            fg=self.theme["fg"],
-            selectbackground=self.theme["accent"]
-        )
+        self.files_list.set_theme(self.theme)
+        self.loading_animation.set_theme(self.theme)
+        self.preview_canvas.config(bg=self.theme["frame_bg"])
+        self._show_preview(self.preview_sheets, None)
         
         # Update material buttons
         button_bg = self.theme["accent"]
@@ -861,70 +3718,153 @@ class App(tk.Tk):
             )
             
             # Save animation path for next startup
-            try:
-                config_dir = os.path.join(os.path.expanduser("~"), ".pdf_processor")
-                os.makedirs(config_dir, exist_ok=True)
-                
-                with open(os.path.join(config_dir, "config.txt"), "w") as f:
-                    f.write(f"animation_path={self.animation_path}\n")
-            except Exception as e:
-                print(f"Error saving animation config: {e}")
+            save_config({"animation_path": self.animation_path})
 
     def select_files(self):
         """Select PDF files to process"""
-        paths = filedialog.askopenfilenames(title="Choose PDF files", filetypes=[("PDF Files","*.pdf")])
+        paths = filedialog.askopenfilenames(title="Choose PDF files",
+                                            filetypes=[("PDF Files and Zip Archives", "*.pdf *.zip"),
+                                                       ("PDF Files", "*.pdf"),
+                                                       ("Zip Archives", "*.zip")])
         if not paths: 
             return
             
-        self.file_paths = list(paths)
-        self.files_list.delete(0, tk.END)
-        
-        for p in self.file_paths:
-            self.files_list.insert(tk.END, os.path.basename(p))
+        self._scan_inputs(paths=paths)
+
+    def select_folder(self):
+        """Add every PDF under a folder (recursively) to the selection"""
+        d = filedialog.askdirectory(title="Choose a folder of PDF files")
+        if not d:
+            return
             
+        self._scan_inputs(paths=self.file_paths, folders=[d])
+
+    def _scan_inputs(self, paths=(), folders=()):
+        """Pre-scan inputs in the background; the list is filled once the scan is done"""
+        self.scanning = True
         self.progress['value'] = 0
         self.detail_progress['value'] = 0
-        self.status_label.config(text=f"{len(self.file_paths)} files selected")
+        self.status_label.config(text="Scanning files...")
         self.detail_label.config(text="")
-        
-        # Show pulse animation briefly
         self._show_loading_animation()
-        self.after(1000, self._hide_loading_animation)
+        self.pre_scanner.scan(paths, folders, skip_first=self.skip_first_var.get())
 
-    def _show_loading_animation(self):
-        """Show a loading animation"""
-        if self.loading_animation:
-            self.loading_animation.pack_forget()
-            
-        # Create a simple loading animation
-        dots_frame = ttk.Frame(self.animation_frame)
-        dots_frame.pack(pady=5)
+    def _on_scan_progress(self, done, total):
+        if done:
+            self.status_label.config(text=f"Scanning files... {done}/{total}")
+        else:
+            self.status_label.config(text=f"Finding PDF files... {total} found")
+
+    def _on_scan_done(self, infos):
+        """Fill the file list with valid inputs and report the rejected ones"""
+        self.scanning = False
+        self._hide_loading_animation()
         
-        for i in range(5):
-            dot = ttk.Label(dots_frame, text="●", font=("Arial", 12))
-            dot.grid(row=0, column=i, padx=3)
-            
-            # Animated dot color change
-            self.after(i * 150, lambda d=dot: d.config(foreground=self.theme["accent"]))
-            self.after((i + 5) * 150, lambda d=dot: d.config(foreground=self.theme["fg"]))
+        rejected = [info for info in infos if not info.valid]
+        self.file_info = {info.path: info for info in infos if info.valid}
+        self.file_paths = list(self.file_info)
+        self.files_list.set_items(self.file_paths)
+        self._refresh_file_details()
+        
+        total_sheets = sum(info.sheet_count(self.skip_first_var.get(), self.pages_per_sheet_var.get())
+                           for info in self.file_info.values())
+        self.status_label.config(
+            text=f"{len(self.file_paths)} files selected ({total_sheets} sheets)")
+        self.update_preview()
+        
+        if rejected:
+            msg = "These files can't be processed and were skipped:\n" + \
+                  "\n".join(f"{input_name(info.path)}: {info.error}" for info in rejected[:20])
+            if len(rejected) > 20:
+                msg += f"\n...and {len(rejected) - 20} more"
+            messagebox.showwarning("Some files were skipped", msg)
+
+    def _refresh_file_details(self):
+        skip_first = self.skip_first_var.get()
+        pages_per_sheet = self.pages_per_sheet_var.get()
+        self.files_list.set_details({
+            path: info.describe(skip_first, pages_per_sheet) for path, info in self.file_info.items()
+        })
+
+    def _on_options_changed(self):
+        self._refresh_file_details()
+        self.update_preview()
+
+    def get_processing_options(self):
+        """Current processing options as PDFProcessor keyword arguments"""
+        return {
+            "skip_first": self.skip_first_var.get(),
+            "add_title": self.add_title_var.get(),
+            "title_on_first_only": self.title_on_first_only_var.get(),
+            "pages_per_sheet": self.pages_per_sheet_var.get(),
+            "optimize": self.optimize_var.get(),
+            "max_file_bytes": self._max_file_bytes(),
+            "composite_dpi": self._composite_dpi() if self.composite_var.get() else None,
+            "verify": self.verify_var.get(),
+        }
+        
+    def _composite_dpi(self):
+        return self.profile.get("composite_dpi") or 300
+        
+    def _composite_label(self):
+        return f"One image per sheet ({self._composite_dpi()} DPI)"
+        
+    def _max_file_bytes(self):
+        """The size limit entered in MB, or None if blank or invalid"""
+        try:
+            mb = float(self.max_file_mb_var.get())
+        except ValueError:
+            return None
+        return int(mb * 1024 * 1024) if mb > 0 else None
+
+    def update_preview(self):
+        """Re-render the preview of the highlighted (or first) file"""
+        if not self.file_paths:
+            self.preview_renderer.cancel()
+            self._show_preview([], None)
+            return
+        selected = self.files_list.selected
+        path = self.file_paths[selected] if selected is not None else self.file_paths[0]
+        self.preview_renderer.request(path, self.get_processing_options())
+
+    def _show_preview(self, sheets, error):
+        """Draw rendered preview sheets (PNG data) stacked in the preview pane"""
+        self.preview_sheets = sheets
+        self.preview_canvas.delete("all")
+        self.preview_images = [tk.PhotoImage(data=data) for data in sheets]
         
-        self.loading_animation = dots_frame
+        y = 0
+        for image in self.preview_images:
+            self.preview_canvas.create_image(0, y, anchor=tk.NW, image=image)
+            y += image.height() + 10
+            
+        if not self.preview_images:
+            text = f"Preview unavailable:\n{error}" if error else "Select PDF files to\nsee a preview"
+            self.preview_canvas.create_text(PREVIEW_WIDTH // 2, 40, text=text, justify=tk.CENTER,
+                                            width=PREVIEW_WIDTH - 20, fill=self.theme["fg"])
+
+    def _show_loading_animation(self):
+        """Show the loading animation"""
+        self._hide_success_animation()
+        self.loading_animation.start()
 
     def _hide_loading_animation(self):
         """Hide the loading animation"""
-        if self.loading_animation:
-            self.loading_animation.pack_forget()
-            self.loading_animation = None
+        self.loading_animation.stop()
 
     def clear_files(self):
         """Clear selected files"""
+        self.pre_scanner.cancel()
+        self.scanning = False
         self.file_paths = []
-        self.files_list.delete(0, tk.END)
+        self.file_info = {}
+        self.files_list.clear()
         self.progress['value'] = 0
         self.detail_progress['value'] = 0
         self.status_label.config(text="File selection cleared")
         self.detail_label.config(text="")
         self._hide_loading_animation()
+        self.update_preview()
 
     def select_directory(self):
         """Select output directory"""
@@ -937,6 +3877,10 @@ class App(tk.Tk):
 
     def start_processing(self):
         """Start processing PDF files"""
+        if self.scanning:
+            messagebox.showwarning("Scan in progress", "Please wait until the selected files are scanned.")
+            return
+            
         if not self.file_paths:
             messagebox.showwarning("Missing input", "Please select PDF files to process.")
             return
@@ -945,8 +3889,21 @@ class App(tk.Tk):
             messagebox.showwarning("Missing output", "Please select an output folder.")
             return
 
+        options = self.get_processing_options()
+        if self.profile:
+            options["render_scale"] = self.profile["render_scale"]
+        start_page = 1 if options["skip_first"] else 0
+        jobs = [
+            BatchJob(pdf, os.path.join(self.output_dir, name), options,
+                     pages=max(0, self.file_info[pdf].page_count - start_page))
+            for pdf, name in zip(self.file_paths, output_names(self.file_paths))
+        ]
+        self.batch_runner = BatchRunner(jobs, workers=self.profile.get("workers"))
+
         # Disable start button
         self.process_btn.config(state='disabled')
+        self.pause_btn.config(state='normal', text="Pause")
+        self.cancel_btn.config(state='normal')
         self.progress['maximum'] = len(self.file_paths)
         self.progress['value'] = 0
         self.detail_progress['value'] = 0
@@ -957,39 +3914,97 @@ class App(tk.Tk):
         # Show processing animation
         self._show_loading_animation()
 
-        threading.Thread(target=self._run_batch, daemon=True).start()
+        threading.Thread(target=self._run_batch, args=(self.batch_runner,), daemon=True).start()
+
+    def autotune(self):
+        """Find the fastest legible settings for the selected files and save them"""
+        if self.scanning or self.batch_runner is not None:
+            messagebox.showwarning("Busy", "Please wait until the current task has finished.")
+            return
+        if not self.file_paths:
+            messagebox.showwarning("Missing input", "Please select PDF files to tune for.")
+            return
+            
+        self.process_btn.config(state='disabled')
+        self.status_label.config(text="Autotuning on a sample of the selected files...")
+        self._show_loading_animation()
+        threading.Thread(target=self._run_autotune,
+                         args=(list(self.file_paths), self.get_processing_options()),
+                         daemon=True).start()
+        
+    def _run_autotune(self, paths, options):
+        """Run the Autotuner in a background thread"""
+        tuner = Autotuner(paths, options, on_result=lambda result: self.progress_channel.publish(
+            "status", f"Tried {result}"))
+        try:
+            profile, error = tuner.run(), None
+        except Exception as e:
+            profile, error = None, str(e)
+        report = "\n".join(str(result) for result in tuner.results)
+        self.progress_channel.publish("tuned", profile, report, error)
+        
+    def _on_tuned(self, profile, report, error):
+        """Save and apply the tuned profile"""
+        self.process_btn.config(state='normal')
+        self._hide_loading_animation()
+        if error:
+            self.status_label.config(text="Autotune failed", foreground=self.theme["status_error"])
+            messagebox.showerror("Autotune Failed", f"{error}\n\n{report}".strip())
+            return
+            
+        save_profile(profile)
+        self.profile = profile
+        self.composite_check.config(text=self._composite_label())
+        if np is not None:
+            self.composite_var.set(bool(profile["composite_dpi"]))
+        self.status_label.config(text=f"Tuned: {describe_profile(profile)}",
+                                 foreground=self.theme["status_good"])
+        messagebox.showinfo("Autotune Complete",
+                            f"Using {describe_profile(profile)} from now on.\n\n{report}")
+
+    def toggle_pause(self):
+        """Pause the running batch at the next page, or resume it"""
+        runner = self.batch_runner
+        if runner is None or runner.cancelled:
+            return
+        if runner.cancel_token.paused:
+            runner.resume()
+            self.pause_btn.config(text="Pause")
+            self.status_label.config(text="Resuming...")
+        else:
+            runner.pause()
+            self.pause_btn.config(text="Resume")
+            self.status_label.config(text="Paused")
+            
+    def cancel_processing(self):
+        """Stop the running batch; workers and partial outputs are cleaned up right away"""
+        if self.batch_runner is None:
+            return
+        self.batch_runner.cancel()
+        self.pause_btn.config(state='disabled', text="Pause")
+        self.cancel_btn.config(state='disabled')
+        self.status_label.config(text="Cancelling...")
 
-    def _run_batch(self):
+    def _run_batch(self, runner):
         """Process batch of PDFs in background thread"""
-        for idx, pdf in enumerate(self.file_paths, 1):
-            name = os.path.basename(pdf)
-            out = os.path.join(self.output_dir, name)
+        self.progress_channel.publish(
+            "status", f"Processing {len(runner.jobs)} files on {runner.workers} workers...")
+        
+        def on_file_done(files_done, job, error):
+            self.progress_channel.publish("file", files_done)
             
-            try:
-                # Update file progress
-                self.after(0, lambda n=name, i=idx: self._update_status_label(
-                    f"Processing file {i}/{len(self.file_paths)}: {n}"))
-                
-                # Create processor with current settings
-                processor = PDFProcessor(
-                    pdf, 
-                    out,
-                    skip_first=self.skip_first_var.get(),
-                    add_title=self.add_title_var.get(),
-                    title_on_first_only=self.title_on_first_only_var.get(),
-                    pages_per_sheet=self.pages_per_sheet_var.get()
-                )
-                
-                # Process with page progress reporting
-                processor.process(progress_callback=self._update_detail_progress)
-                
-            except Exception as e:
-                self.failures.append((name, str(e)))
-            finally:
-                # Update file progress
-                self.after(0, lambda i=idx: self._update_progress(i))
+        try:
+            self.failures.extend(runner.run(on_progress=self._update_detail_progress,
+                                            on_file_done=on_file_done))
+        except Exception as e:
+            self.failures.append(("Batch", str(e)))
+        self.failures.extend((name, SizeBudget.describe_miss(missed))
+                             for name, missed in runner.over_budget)
+        self.optimize_summary = summarize_optimization(runner.optimized)
+        self.flagged_slides = runner.flagged_slides
+        self.fidelity_summary = summarize_fidelity(runner.slides_checked, runner.flagged_slides)
         
-        self.after(0, self._finish)
+        self.progress_channel.publish("done")
 
     def _update_status_label(self, text):
         """Update status label from background thread"""
@@ -999,38 +4014,45 @@ class App(tk.Tk):
         """Update main progress bar from background thread"""
         self.progress['value'] = idx
         
-    def _update_detail_progress(self, current, total):
-        """Update detail progress bar from background thread"""
-        self.after(0, lambda c=current, t=total: self._do_update_detail(c, t))
+    def _update_detail_progress(self, meter):
+        """Report page progress and throughput from background thread"""
+        self.progress_channel.publish("page", meter.pages_done, meter.total_pages, meter.summary())
         
-    def _do_update_detail(self, current, total):
+    def _do_update_detail(self, current, total, summary):
         """Update detail progress UI elements"""
-        self.detail_progress['maximum'] = total
+        self.detail_progress['maximum'] = max(total, 1)
         self.detail_progress['value'] = current
-        self.detail_label.config(text=f"Processing page {current}/{total}")
-        
-        # Periodic animation update to show activity
-        if current % 3 == 0:
-            self._refresh_loading_animation()
-            
-    def _refresh_loading_animation(self):
-        """Refresh the loading animation during processing"""
-        if self.loading_animation:
-            self.loading_animation.pack_forget()
-        
-        self._show_loading_animation()
+        self.detail_label.config(text=summary)
 
     def _finish(self):
         """Clean up after processing completes"""
         self.process_btn.config(state='normal')
+        self.pause_btn.config(state='disabled', text="Pause")
+        self.cancel_btn.config(state='disabled')
         self._hide_loading_animation()
+        cancelled = self.batch_runner is not None and self.batch_runner.cancelled
+        self.batch_runner = None
         
-        if self.failures:
+        if cancelled:
+            self.status_label.config(text="Cancelled", foreground=self.theme["status_error"])
+        elif self.failures:
             msg = "Errors in processing:\n" + "\n".join(f"{n}: {err}" for n, err in self.failures)
             messagebox.showerror("Batch Completed with Errors", msg)
             self.status_label.config(text="Completed with errors", foreground=self.theme["status_error"])
+        elif self.flagged_slides:
+            msg = self.fidelity_summary + ":\n" + "\n".join(
+                f"{name}: {score}" for name, score in self.flagged_slides[:20])
+            if len(self.flagged_slides) > 20:
+                msg += f"\n...and {len(self.flagged_slides) - 20} more"
+            messagebox.showwarning("Batch Completed - Check Legibility", msg)
+            self.status_label.config(text="Done; some slides may be illegible",
+                                     foreground=self.theme["status_error"])
         else:
-            messagebox.showinfo("Batch Completed", "All files processed successfully")
+            msg = "All files processed successfully"
+            for summary in (self.optimize_summary, self.fidelity_summary):
+                if summary:
+                    msg += "\n\n" + summary
+            messagebox.showinfo("Batch Completed", msg)
             self.status_label.config(text="All done!", foreground=self.theme["status_good"])
             
             # Show success animation
@@ -1041,29 +4063,28 @@ class App(tk.Tk):
         
     def _show_success_animation(self):
         """Show success animation"""
-        success_frame = ttk.Frame(self.animation_frame)
-        success_frame.pack(pady=5)
-        
-        # Create checkmark animation
-        checkmark = ttk.Label(success_frame, text="✓", font=("Arial", 24),
-                             foreground=self.theme["status_good"])
-        checkmark.pack()
-        
-        # Animate checkmark
-        def _animate_checkmark(size=24, direction=1):
-            if 20 <= size <= 32:
-                checkmark.config(font=("Arial", size))
-                self.after(50, lambda: _animate_checkmark(size + direction, 
-                                                         direction if size < 32 and direction > 0 
-                                                         else -1 if size >= 32 
-                                                         else -direction if size <= 20 else direction))
+        self._hide_success_animation()
+        self.success_label.config(font=("Arial", 24), foreground=self.theme["status_good"])
+        self.success_label.pack(pady=5)
+        
+        # Animate checkmark: grow to 32pt, shrink back, then hide
+        sizes = list(range(24, 33)) + list(range(31, 19, -1))
+        
+        def _animate_checkmark(step=0):
+            if step < len(sizes):
+                self.success_label.config(font=("Arial", sizes[step]))
+                self._success_after_id = self.after(50, lambda: _animate_checkmark(step + 1))
             else:
-                # End animation after a few cycles
-                self.after(1000, lambda: success_frame.pack_forget())
+                self._success_after_id = self.after(1000, self._hide_success_animation)
                 
         _animate_checkmark()
-        
-        self.loading_animation = success_frame
+
+    def _hide_success_animation(self):
+        """Cancel and hide the success animation"""
+        if self._success_after_id is not None:
+            self.after_cancel(self._success_after_id)
+            self._success_after_id = None
+        self.success_label.pack_forget()
 
 # Load saved configuration
 def load_config():
@@ -1082,7 +4103,307 @@ def load_config():
         
     return config
 
-if __name__ == "__main__":
+def save_config(updates):
+    """Merge updates into the saved configuration"""
+    config = load_config()
+    config.update(updates)
+    try:
+        os.makedirs(CONFIG_DIR, exist_ok=True)
+        with open(os.path.join(CONFIG_DIR, "config.txt"), "w") as f:
+            for key, value in config.items():
+                f.write(f"{key}={value}\n")
+    except Exception as e:
+        print(f"Error saving config: {e}")
+
+def load_profile(config=None):
+    """The settings saved by the last autotune run, or {} if there are none"""
+    config = load_config() if config is None else config
+    try:
+        dpi = config.get("tuned_composite_dpi")
+        return {
+            "workers": int(config["tuned_workers"]),
+            "render_scale": float(config["tuned_render_scale"]),
+            "composite_dpi": int(dpi) if dpi else None,
+        }
+    except (KeyError, ValueError):
+        return {}
+
+def save_profile(profile):
+    """Save an Autotuner profile for later runs"""
+    save_config({f"tuned_{key}": "" if value is None else value for key, value in profile.items()})
+
+def build_arg_parser():
+    """Command line options; with no inputs the GUI is started"""
+    parser = argparse.ArgumentParser(
+        prog="slide2print",
+        description="Convert slide PDFs into compact, ink-saving printable PDFs.")
+    parser.add_argument("inputs", nargs="*",
+                        help="PDF files, zip archives of PDFs, folders (searched recursively) "
+                             "or - for a PDF on stdin")
+    parser.add_argument("-o", "--output-dir", help="Folder for the converted PDFs")
+    parser.add_argument("--output-zip", metavar="FILE",
+                        help="Write the converted PDFs into this zip archive instead")
+    parser.add_argument("-n", "--pages-per-sheet", type=int, default=3, choices=PAGES_PER_SHEET)
+    parser.add_argument("--keep-first", action="store_true", help="Don't skip the first page")
+    parser.add_argument("--no-title", action="store_true", help="Don't add titles to sheets")
+    parser.add_argument("--title-first-only", action="store_true",
+                        help="Only add the title to the first sheet")
+    parser.add_argument("--paper", default="A4", choices=sorted(PAPER_SIZES), help="Paper size")
+    parser.add_argument("--optimize", action="store_true",
+                        help="Compact the outputs (and linearize them if pikepdf is installed)")
+    parser.add_argument("--max-file-size", type=parse_size, metavar="SIZE",
+                        help="Encode pages so each output stays under SIZE, e.g. 10M")
+    parser.add_argument("--max-sheet-size", type=parse_size, metavar="SIZE",
+                        help="Encode pages so each sheet stays under SIZE, e.g. 300K")
+    parser.add_argument("--composite", type=int, nargs="?", const=300, default=None, metavar="DPI",
+                        help="Embed each sheet as one image at DPI (default 300; needs numpy)")
+    parser.add_argument("--verify", action="store_true",
+                        help="Compare every slide with the source and flag illegible ones "
+                             "(needs numpy; exit code 1 if any are flagged)")
+    parser.add_argument("-t", "--target", action="append", metavar="N:PAPER[:notitle|:firstonly]",
+                        help="Extra layout rendered in the same pass as the -n/--paper one, "
+                             "e.g. -t 6:Letter (repeatable; written as <file>_<N>up_<PAPER>.pdf "
+                             "next to <file>.pdf)")
+    parser.add_argument("-j", "--workers", type=int, default=None,
+                        help="Number of worker processes (default: from the tuned profile, "
+                             "else CPU count - 1)")
+    parser.add_argument("--autotune", action="store_true",
+                        help="Time a sample of the inputs under several settings first, then "
+                             "convert with the fastest legible one and save it as the profile")
+    parser.add_argument("--no-profile", action="store_true",
+                        help="Ignore the settings saved by --autotune")
+    parser.add_argument("--timeout", type=float, default=None, metavar="SECONDS",
+                        help="Give up on a file after this long (default: scaled by page count)")
+    parser.add_argument("--memory-limit", type=int, default=BatchRunner.DEFAULT_MEMORY_LIMIT,
+                        metavar="MB", help="Give up on a file whose worker uses more memory "
+                                           "(default: %(default)s; 0 for no limit; enforced "
+                                           "with psutil, or else on POSIX and Windows only)")
+    spool = parser.add_argument_group("spool mode (multi-machine)")
+    spool.add_argument("--spool", metavar="DIR",
+                       help="Shared job folder: inputs are queued there instead of converted")
+    spool.add_argument("--worker", action="store_true",
+                       help="Convert jobs from the --spool folder until stopped")
+    spool.add_argument("--drain", action="store_true",
+                       help="With --worker, exit once the queue is empty")
+    spool.add_argument("--lease", type=int, default=120, metavar="SECONDS",
+                       help="Lease time after which a dead worker's job is retried")
+    return parser
+
+def parse_target_spec(spec, output_path, options):
+    """Turn 'N:PAPER[:notitle|:firstonly]' into OutputTarget keyword arguments"""
+    parts = spec.split(":")
+    try:
+        pages_per_sheet = int(parts[0])
+    except ValueError:
+        raise ValueError(f"Bad target '{spec}': expected pages per sheet, e.g. 3:A4")
+    if pages_per_sheet not in PAGES_PER_SHEET:
+        raise ValueError(f"Bad target '{spec}': pages per sheet must be one of "
+                         f"{', '.join(map(str, PAGES_PER_SHEET))}")
+    paper = parts[1] if len(parts) > 1 and parts[1] else "A4"
+    flags = set(parts[2:])
+    unknown = flags - {"notitle", "firstonly"}
+    if unknown:
+        raise ValueError(f"Bad target '{spec}': unknown option '{sorted(unknown)[0]}' "
+                         f"(use notitle or firstonly)")
+    
+    stem = os.path.splitext(output_path)[0]
+    return {
+        "output_path": f"{stem}_{pages_per_sheet}up_{paper}.pdf",
+        "pages_per_sheet": pages_per_sheet,
+        "paper": paper,
+        "add_title": options["add_title"] and "notitle" not in flags,
+        "title_on_first_only": options["title_on_first_only"] or "firstonly" in flags,
+    }
+
+def job_options(args, options, output_path):
+    """Options for one input, expanding --target specs into outputs named after output_path"""
+    if not args.target:
+        return options
+    # The -n/--paper layout still goes to output_path; targets come on top of it
+    base = {key: options[key] for key in ("pages_per_sheet", "paper", "add_title",
+                                          "title_on_first_only")}
+    targets = [dict(base, output_path=output_path)]
+    targets += [parse_target_spec(spec, output_path, options) for spec in args.target]
+    return dict(options, targets=targets)
+
+def run_spool_cli(args, options):
+    """Queue inputs into a spool, or run spool workers"""
+    if args.worker:
+        workers = args.workers or default_worker_count()
+        limits = {"drain": args.drain, "timeout": args.timeout, "memory_limit": args.memory_limit}
+        if workers == 1:
+            run_spool_worker(args.spool, args.lease, **limits)
+            return 0
+        ctx = multiprocessing.get_context("spawn")
+        procs = [ctx.Process(target=run_spool_worker, args=(args.spool, args.lease), kwargs=limits)
+                 for _ in range(workers)]
+        for proc in procs:
+            proc.start()
+        for proc in procs:
+            proc.join()
+        return 0
+        
+    if not args.output_dir:
+        print("error: --output-dir is required", file=sys.stderr)
+        return 2
+    if "-" in args.inputs:
+        print("error: stdin can't be queued to a spool", file=sys.stderr)
+        return 2
+    spool = JobSpool(args.spool, args.lease)
+    paths = [os.path.abspath(path) for item in args.inputs for path in expand_input(item)]
+    output_dir = os.path.abspath(args.output_dir)
+    for path, name in zip(paths, output_names(paths)):
+        out = os.path.join(output_dir, name)
+        spool.submit(path, out, job_options(args, options, out))
+    print(f"Queued jobs; spool now holds {spool.counts()}")
+    return 0
+
+def run_cli(args):
+    """Convert the inputs from the command line; returns the process exit code"""
+    options = {
+        "skip_first": not args.keep_first,
+        "add_title": not args.no_title,
+        "title_on_first_only": args.title_first_only,
+        "pages_per_sheet": args.pages_per_sheet,
+        "paper": args.paper,
+        "optimize": args.optimize,
+        "max_file_bytes": args.max_file_size,
+        "max_sheet_bytes": args.max_sheet_size,
+        "composite_dpi": args.composite,
+        "verify": args.verify,
+    }
+    if args.target:
+        try:
+            for spec in args.target:
+                OutputTarget(**parse_target_spec(spec, "x.pdf", options))
+        except ValueError as e:
+            print(f"error: {e}", file=sys.stderr)
+            return 2
+    if (args.composite or args.verify) and np is None:
+        print("error: --composite and --verify need numpy (pip install numpy)", file=sys.stderr)
+        return 2
+    if args.autotune and args.spool:
+        print("error: --autotune can't be used with --spool", file=sys.stderr)
+        return 2
+    profile = {} if args.no_profile or args.autotune else load_profile()
+    if profile:
+        print(f"Using tuned profile: {describe_profile(profile)}")
+        apply_profile(args, options, profile)
+            
+    if args.spool:
+        return run_spool_cli(args, options)
+        
+    if not args.output_dir and not args.output_zip:
+        print("error: --output-dir or --output-zip is required", file=sys.stderr)
+        return 2
+    
+    sources = []
+    for item in args.inputs:
+        # Zip members and stdin are read into memory; nothing is extracted to disk
+        sources.extend([sys.stdin.buffer.read()] if item == "-" else expand_input(item))
+        
+    zip_output = ZipOutput(args.output_zip) if args.output_zip else None
+    output_dir = zip_output.staging_dir if zip_output else args.output_dir
+    os.makedirs(output_dir, exist_ok=True)
+    code = 130
+    try:
+        code = _convert_sources(args, options, sources, output_dir, zip_output)
+        return code
+    finally:
+        if zip_output:
+            # A cancelled or crashed run leaves no half-filled archive behind
+            zip_output.close(keep=code != 130)
+
+def apply_profile(args, options, profile):
+    """Use a tuned profile's settings, except those given on the command line"""
+    options["render_scale"] = profile["render_scale"]
+    if args.composite is None and (profile["composite_dpi"] is None or np is not None):
+        options["composite_dpi"] = profile["composite_dpi"]
+    if args.workers is None:
+        args.workers = profile["workers"]
+
+def run_autotune(args, options, sources):
+    """Tune on a sample of sources, save the profile and apply it to args and options"""
+    print("Autotuning on a sample of the inputs...")
+    tuner = Autotuner(sources, options, memory_limit=args.memory_limit,
+                      composite_dpis=(args.composite,) if args.composite else None,
+                      on_result=lambda result: print(f"  {result}"))
+    try:
+        profile = tuner.run()
+    except RuntimeError as e:
+        print(f"Autotune failed, keeping the current settings: {e}", file=sys.stderr)
+        return
+    save_profile(profile)
+    print(f"Saved tuned profile: {describe_profile(profile)}")
+    apply_profile(args, options, profile)
+
+def _convert_sources(args, options, sources, output_dir, zip_output):
+    """Pre-scan and convert sources into output_dir, moving finished files into zip_output"""
+    # Pre-scan so bad files are reported up front and jobs can be ordered by size
+    valid, failures = [], []
+    for source in sources:
+        info = scan_pdf(source, options["skip_first"])
+        if not info.valid:
+            failures.append((input_name(source), info.error))
+            continue
+        valid.append((source, info.page_count - (1 if options["skip_first"] else 0)))
+        
+    if args.autotune and valid:
+        run_autotune(args, options, [source for source, pages in valid])
+        
+    jobs = []
+    for (source, pages), name in zip(valid, output_names(source for source, pages in valid)):
+        out = os.path.join(output_dir, name)
+        jobs.append(BatchJob(source, out, job_options(args, options, out), pages=pages))
+        
+    def on_file_done(files_done, job, error):
+        if zip_output and error is None:
+            for path in job.output_paths:
+                try:
+                    zip_output.add(path)
+                except ValueError as e:
+                    failures.append((job.name, str(e)))
+                
+    if jobs:
+        runner = BatchRunner(jobs, workers=args.workers, timeout=args.timeout,
+                             memory_limit=args.memory_limit)
+        print(f"Converting {len(jobs)} files ({runner.total_pages} pages) on {runner.workers} workers")
+        
+        last_print = [0.0]
+        def on_progress(meter):
+            # Redraw the status line a few times a second at most
+            now = time.monotonic()
+            if now - last_print[0] >= 0.25 or meter.pages_done == meter.total_pages:
+                last_print[0] = now
+                print(f"\r{meter.summary():<60}", end="", flush=True)
+                
+        try:
+            failures.extend(runner.run(on_progress=on_progress, on_file_done=on_file_done))
+        except KeyboardInterrupt:
+            # Leaving run() kills the workers and removes their partial outputs
+            print("\nCancelled", file=sys.stderr)
+            return 130
+        print(f"\nDone in {format_duration(runner.meter.elapsed)}")
+        for result in runner.optimized:
+            print(f"  {result}")
+        if runner.optimized:
+            print(summarize_optimization(runner.optimized))
+        if runner.slides_checked:
+            print(summarize_fidelity(runner.slides_checked, runner.flagged_slides))
+            for name, score in runner.flagged_slides:
+                failures.append((name, f"may be illegible: {score}"))
+        for name, missed in runner.over_budget:
+            failures.append((name, SizeBudget.describe_miss(missed)))
+        
+    for name, error in failures:
+        print(f"{name}: {error}", file=sys.stderr)
+    return 1 if failures else 0
+
+def main(argv=None):
+    args = build_arg_parser().parse_args(argv)
+    if args.inputs or args.spool:
+        return run_cli(args)
+        
     # Load config
     config = load_config()
     
@@ -1094,4 +4415,11 @@ if __name__ == "__main__":
         app.animation_path = config["animation_path"]
     
     # Apply some styling
-    app.mainloop()
\ No newline at end of file
+    app.mainloop()
+    return 0
+
+if __name__ == "__main__":
+    # Needed for process pools in the bundled executable
+    multiprocessing.freeze_support()
+    
+    sys.exit(main())
\ No newline at end of file